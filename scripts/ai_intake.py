@@ -15,25 +15,52 @@ Usage:
         --context "Focus on the BEC variant" \
         --output-dir ThreatPaths
 
+Batch mode (Anthropic Message Batches API, 50% cost, results within 24h):
+    python scripts/ai_intake.py --batch --url URL1 --url URL2 ...
+    python scripts/ai_intake.py --collect BATCH_ID
+    (TP IDs are assigned when the results are collected, not on submit.)
+
 Environment variables:
     ANTHROPIC_API_KEY  — Claude API key (primary)
     OPENAI_API_KEY     — GPT-4o API key (fallback)
 """
 
 import argparse
+import codecs
+import collections
+import concurrent.futures
+import contextlib
+import functools
+import hashlib
 import ipaddress
 import json
 import os
+import queue
 import re
 import socket
 import sys
+import threading
+import time
 import unicodedata
 from datetime import date
 from pathlib import Path
 from urllib.parse import urlparse
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer
+from bs4.dammit import EncodingDetector
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 # ---------------------------------------------------------------------------
@@ -44,17 +71,161 @@ REPO_ROOT = Path(__file__).resolve().parent.parent
 THREAT_PATHS_DIR = REPO_ROOT / "ThreatPaths"
 CFPF_TECHNIQUES_FILE = REPO_ROOT / "cfpf_techniques.json"
 TEMPLATE_FILE = REPO_ROOT / "Templates" / "threat-path-template.md"
+CACHE_DIR = REPO_ROOT / ".cache" / "ai_intake"  # LLM responses keyed by prompt hash
+BATCH_MANIFEST_DIR = CACHE_DIR / "batches"
 
 # LLM configuration
 ANTHROPIC_MODEL = "claude-3-7-sonnet-latest"
 OPENAI_MODEL = "gpt-4o"
 
 ANTHROPIC_URL = "https://api.anthropic.com/v1/messages"
+ANTHROPIC_BATCHES_URL = "https://api.anthropic.com/v1/messages/batches"
 OPENAI_URL = "https://api.openai.com/v1/chat/completions"
 
 MAX_ARTICLE_CHARS = 30000  # truncate long articles to fit context
 MAX_TOKENS = 8000          # max response tokens
+HEDGE_DELAY_SECONDS = 30   # start the fallback provider if the primary is still pending
 MAX_RESPONSE_BYTES = 10 * 1024 * 1024  # 10 MB max response size
+FETCH_CHUNK_BYTES = 64 * 1024          # streamed download chunk size
+FETCH_WORKERS = 4                      # concurrent article fetches
+
+# Per-provider rate limits: (requests/min, input tokens/min, max in-flight)
+ANTHROPIC_LIMITS = (50, 80_000, 4)
+OPENAI_LIMITS = (60, 150_000, 4)
+
+# Batch prompts carry this placeholder; the real ID is assigned on --collect
+BATCH_TP_ID_PLACEHOLDER = "TP-0000"
+
+# Precompiled patterns
+BLANK_LINES_RE = re.compile(r"\n{3,}")
+CHARSET_RE = re.compile(r"charset=[\"']?([\w.:-]+)", re.IGNORECASE)
+SLUG_RE = re.compile(r"[^a-z0-9]+")
+TITLE_RE = re.compile(r"^[ \t]*# TP-\d{4}:[ \t]*(\S.*)", re.MULTILINE)
+TITLE_ID_RE = re.compile(r"^([ \t]*# )TP-\d{4}(?=:)", re.MULTILINE)
+FRONTMATTER_ID_RE = re.compile(r"^([ \t]*id:[ \t]*([\"']?))TP-\d{4}(?=\2)", re.MULTILINE)
+FRONTMATTER_DATE_RE = re.compile(r"^([ \t]*date:[ \t]*([\"']?))\d{4}-\d{2}-\d{2}(?=\2)",
+                                 re.MULTILINE)
+RAW_FRONTMATTER_RE = re.compile(r"^[ \t]*---[ \t]*\n(.*?)^[ \t]*---[ \t]*$",
+                                re.MULTILINE | re.DOTALL)
+
+# Elements stripped before text extraction
+BOILERPLATE_TAGS = ("script", "style", "nav", "footer", "header", "aside",
+                    "form", "button", "noscript", "iframe")
+
+# Only <title> and <body> are built into the parse tree; scripts, styles
+# and metadata in <head> are never materialised.
+CONTENT_STRAINER = SoupStrainer(["title", "body"])
+
+
+# ---------------------------------------------------------------------------
+# HTTP session
+# ---------------------------------------------------------------------------
+
+def _build_session() -> requests.Session:
+    """Build a pooled session shared by the fetch and LLM calls.
+
+    Keeps connections alive across requests. Article fetches (GET) retry
+    transient 429/5xx responses and dropped connections with backoff.
+
+    LLM API calls are POSTs that generate (and bill) on the server, so
+    they get their own adapter: only failed connects and explicit
+    429/529 rejections are retried, never a read timeout or a connection
+    lost after the request was sent.
+    """
+    fetch_retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+    )
+    llm_retry = Retry(
+        total=3,
+        read=0,
+        other=0,
+        backoff_factor=0.3,
+        status_forcelist=[429, 529],
+        allowed_methods=frozenset({"GET", "POST"}),
+        raise_on_status=False,
+    )
+    fetch_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8,
+                                max_retries=fetch_retry)
+    llm_adapter = HTTPAdapter(pool_connections=2, pool_maxsize=8,
+                              max_retries=llm_retry)
+    session = requests.Session()
+    session.mount("https://", fetch_adapter)
+    session.mount("http://", fetch_adapter)
+    # requests picks the longest matching prefix, so these win for LLM hosts
+    for url in (ANTHROPIC_URL, OPENAI_URL):
+        parts = urlparse(url)
+        session.mount(f"{parts.scheme}://{parts.netloc}/", llm_adapter)
+    return session
+
+
+SESSION = _build_session()
+
+
+# ---------------------------------------------------------------------------
+# Rate limiting
+# ---------------------------------------------------------------------------
+
+class RateLimiter:
+    """Sliding-window request and token limiter for one LLM provider.
+
+    reserve() blocks until both the per-minute request and token budgets
+    have room, so batched intakes are throttled before the provider
+    starts answering with 429s.
+    """
+
+    WINDOW_SECONDS = 60.0
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int,
+                 max_concurrency: int):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._sent: collections.deque = collections.deque()  # (timestamp, tokens)
+        self._tokens_in_window = 0
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+    def _wait_time(self, tokens: int) -> float:
+        """Admit a request and return 0, or return how long to wait. Lock held."""
+        now = time.monotonic()
+        while self._sent and now - self._sent[0][0] >= self.WINDOW_SECONDS:
+            self._tokens_in_window -= self._sent.popleft()[1]
+
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        if (len(self._sent) < self.requests_per_minute
+                and self._tokens_in_window + tokens <= self.tokens_per_minute):
+            self._sent.append((now, tokens))
+            self._tokens_in_window += tokens
+            return 0.0
+        return self.WINDOW_SECONDS - (now - self._sent[0][0])
+
+    @contextlib.contextmanager
+    def reserve(self, tokens: int):
+        """Hold a request slot for an estimated number of input tokens."""
+        tokens = min(tokens, self.tokens_per_minute)
+        while True:
+            with self._lock:
+                wait = self._wait_time(tokens)
+            if wait <= 0:
+                break
+            time.sleep(wait)
+
+        with self._slots:
+            yield
+
+    def back_off(self, seconds: float) -> None:
+        """Refuse new requests for ``seconds`` after the provider returns 429."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
+ANTHROPIC_LIMITER = RateLimiter(*ANTHROPIC_LIMITS)
+OPENAI_LIMITER = RateLimiter(*OPENAI_LIMITS)
 
 
 # ---------------------------------------------------------------------------
@@ -110,6 +281,87 @@ def _validate_url(url: str) -> None:
 # URL fetching
 # ---------------------------------------------------------------------------
 
+def _read_capped(resp: requests.Response, limit: int) -> bytes:
+    """Read a streamed response body, stopping once ``limit`` bytes are held."""
+    buf = bytearray()
+    for chunk in resp.iter_content(FETCH_CHUNK_BYTES):
+        buf += chunk
+        if len(buf) >= limit:
+            del buf[limit:]
+            break
+    resp.close()
+    return bytes(buf)
+
+
+def _declared_charset(content_type: str) -> str | None:
+    """Return the charset named in a Content-Type header, if Python knows it."""
+    match = CHARSET_RE.search(content_type)
+    if not match:
+        return None
+    try:
+        return codecs.lookup(match.group(1)).name
+    except LookupError:
+        return None
+
+
+def _sniffed_charset(markup: bytes) -> tuple[bytes, str | None]:
+    """Find the charset from a BOM or <meta charset>, as BeautifulSoup does.
+
+    Returns the markup with any BOM removed, and the charset if Python
+    knows it.
+    """
+    markup, encoding = EncodingDetector.strip_byte_order_mark(markup)
+    if encoding is None:
+        encoding = EncodingDetector.find_declared_encoding(markup, is_html=True)
+    if encoding is None:
+        return markup, None
+    try:
+        return markup, codecs.lookup(encoding).name
+    except LookupError:
+        return markup, None
+
+
+def _parse_html(markup: bytes, encoding: str | None) -> BeautifulSoup:
+    """Parse HTML with lxml, falling back to the stdlib parser.
+
+    With no declared encoding, BeautifulSoup detects it from the BOM or
+    <meta charset>.
+    """
+    try:
+        return BeautifulSoup(markup, "lxml", parse_only=CONTENT_STRAINER,
+                             from_encoding=encoding)
+    except FeatureNotFound:
+        # html.parser does not synthesise <body> for fragments, so it
+        # has to build the full tree.
+        return BeautifulSoup(markup, "html.parser", from_encoding=encoding)
+
+
+def _html_to_text(markup: bytes, encoding: str | None = None) -> str:
+    """Strip boilerplate elements and return the readable text of a page.
+
+    Uses selectolax's Lexbor bindings when installed, otherwise BeautifulSoup.
+    ``encoding`` is the charset declared by the server, if any; without it
+    both paths fall back to the page's BOM or <meta charset>.
+    """
+    if LexborHTMLParser is not None:
+        if not encoding:
+            markup, encoding = _sniffed_charset(markup)
+        # Lexbor reads bytes as UTF-8; only decode up front for other charsets
+        if encoding and encoding != "utf-8":
+            markup = markup.decode(encoding, errors="replace")
+        tree = LexborHTMLParser(markup)
+        for node in tree.css(",".join(BOILERPLATE_TAGS)):
+            node.decompose()
+        if tree.root is None:
+            return ""
+        return tree.root.text(separator="\n", strip=True)
+
+    soup = _parse_html(markup, encoding)
+    for tag in soup(list(BOILERPLATE_TAGS)):
+        tag.decompose()
+    return soup.get_text(separator="\n", strip=True)
+
+
 def fetch_url_content(url: str) -> str:
     """Fetch a URL and extract readable text content."""
     _validate_url(url)
@@ -123,8 +375,8 @@ def fetch_url_content(url: str) -> str:
     }
 
     try:
-        resp = requests.get(url, headers=headers, timeout=30, allow_redirects=True,
-                            stream=True)
+        resp = SESSION.get(url, headers=headers, timeout=30, allow_redirects=True,
+                           stream=True)
         resp.raise_for_status()
 
         # Check content length before reading full body
@@ -134,9 +386,8 @@ def fetch_url_content(url: str) -> str:
                   f"max {MAX_RESPONSE_BYTES}).", file=sys.stderr)
             sys.exit(1)
 
-        # Read with size limit
-        content = resp.content[:MAX_RESPONSE_BYTES]
-        text_content = content.decode(resp.encoding or "utf-8", errors="replace")
+        # Read with size limit, without buffering anything past the cap
+        content = _read_capped(resp, MAX_RESPONSE_BYTES)
     except requests.RequestException as e:
         print(f"ERROR: Failed to fetch URL: {e}", file=sys.stderr)
         sys.exit(1)
@@ -148,19 +399,12 @@ def fetch_url_content(url: str) -> str:
         return f"[PDF document from {url} — content extraction not supported. " \
                f"The AI should note this is a PDF source and work with available metadata.]"
 
-    # Parse HTML
-    soup = BeautifulSoup(text_content, "html.parser")
-
-    # Remove script, style, nav, footer, header elements
-    for tag in soup(["script", "style", "nav", "footer", "header", "aside",
-                     "form", "button", "noscript", "iframe"]):
-        tag.decompose()
-
-    # Extract text
-    text = soup.get_text(separator="\n", strip=True)
+    # Parse HTML and extract text. The raw bytes go to the parser so
+    # requests never runs its charset sniffing over the body.
+    text = _html_to_text(content, _declared_charset(content_type))
 
     # Collapse multiple blank lines
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = BLANK_LINES_RE.sub("\n\n", text)
 
     # Truncate to fit context window
     if len(text) > MAX_ARTICLE_CHARS:
@@ -175,23 +419,52 @@ def fetch_url_content(url: str) -> str:
 
 def get_next_tp_id() -> str:
     """Scan ThreatPaths/ and return the next available TP-XXXX ID."""
-    existing_ids = []
+    highest = 0
     if THREAT_PATHS_DIR.exists():
-        for f in THREAT_PATHS_DIR.glob("TP-*.md"):
-            match = re.match(r"TP-(\d{4})", f.stem)
-            if match:
-                existing_ids.append(int(match.group(1)))
+        with os.scandir(THREAT_PATHS_DIR) as entries:
+            for entry in entries:
+                name = entry.name
+                digits = name[3:7]
+                # isdecimal(), like regex \d: isdigit() also accepts '²',
+                # which int() rejects
+                if (name.startswith("TP-") and name.endswith(".md")
+                        and digits.isdecimal()):
+                    highest = max(highest, int(digits))
+
+    return f"TP-{highest + 1:04d}"
 
-    next_num = max(existing_ids, default=0) + 1
-    return f"TP-{next_num:04d}"
+
+def _build_ascii_map() -> dict[int, str]:
+    """Translation table from common non-ASCII characters to ASCII.
+
+    Latin-1, Latin Extended-A and general punctuation are mapped to what
+    NFKD decomposition plus ASCII filtering would produce. Letters that do
+    not decompose (ß, æ, ø, ...) get conventional transliterations.
+    """
+    table = {}
+    for start, end in ((0x00A0, 0x0180), (0x2010, 0x2027)):
+        for cp in range(start, end):
+            decomposed = unicodedata.normalize("NFKD", chr(cp))
+            table[cp] = decomposed.encode("ascii", "ignore").decode("ascii")
+    table.update(str.maketrans({
+        "ß": "ss", "æ": "ae", "Æ": "AE", "ø": "o", "Ø": "O", "œ": "oe", "Œ": "OE",
+        "ð": "d", "Ð": "D", "đ": "d", "Đ": "D", "þ": "th", "Þ": "TH", "ł": "l", "Ł": "L",
+    }))
+    return table
+
+
+ASCII_MAP = _build_ascii_map()
 
 
 def slugify(text: str) -> str:
     """Convert text to a URL-safe slug."""
-    text = unicodedata.normalize("NFKD", text)
-    text = text.encode("ascii", "ignore").decode("ascii")
+    if not text.isascii():
+        text = text.translate(ASCII_MAP)
+        if not text.isascii():
+            text = unicodedata.normalize("NFKD", text)
+            text = text.encode("ascii", "ignore").decode("ascii")
     text = text.lower()
-    text = re.sub(r"[^a-z0-9]+", "-", text)
+    text = SLUG_RE.sub("-", text)
     text = text.strip("-")
     # Limit length
     if len(text) > 60:
@@ -208,6 +481,13 @@ def load_cfpf_techniques() -> str:
     if not CFPF_TECHNIQUES_FILE.exists():
         return "CFPF techniques catalog not available."
 
+    st = CFPF_TECHNIQUES_FILE.stat()
+    return _format_cfpf_techniques(st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=4)
+def _format_cfpf_techniques(mtime_ns: int, size: int) -> str:
+    """Format the catalog; cached until the file's mtime or size changes."""
     with open(CFPF_TECHNIQUES_FILE, "r", encoding="utf-8") as f:
         data = json.load(f)
 
@@ -225,6 +505,7 @@ def load_cfpf_techniques() -> str:
 # LLM prompt construction
 # ---------------------------------------------------------------------------
 
+@functools.lru_cache(maxsize=4)
 def build_system_prompt(cfpf_ref: str) -> str:
     """Build the system prompt for the LLM."""
     return f"""You are FLAME-AI, an expert fraud intelligence analyst. Your role is to analyze source material about fraud schemes and generate structured threat path documents for the FLAME (Fraud Lifecycle Analysis & Mitigation Exchange) platform.
@@ -323,15 +604,47 @@ Generate the complete threat path markdown document now. Remember: output ONLY t
 # LLM API calls
 # ---------------------------------------------------------------------------
 
-def call_anthropic(system_prompt: str, user_prompt: str, api_key: str) -> str:
-    """Call Anthropic Claude API."""
-    headers = {
+def _json_dumps(obj) -> bytes:
+    """Serialize to UTF-8 JSON bytes, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def _json_loads(data: bytes):
+    """Parse JSON bytes, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _estimate_tokens(*texts: str) -> int:
+    """Rough input-token estimate (~4 characters per token)."""
+    return sum(len(t) for t in texts) // 4
+
+
+def _handle_rate_limit(limiter: RateLimiter, exc: Exception) -> None:
+    """Pause the limiter when a call failed with HTTP 429."""
+    resp = getattr(exc, "response", None)
+    if resp is None or resp.status_code != 429:
+        return
+    try:
+        delay = float(resp.headers.get("retry-after", ""))
+    except ValueError:
+        delay = RateLimiter.WINDOW_SECONDS
+    limiter.back_off(delay)
+
+
+def _anthropic_headers(api_key: str) -> dict:
+    return {
         "x-api-key": api_key,
         "anthropic-version": "2023-06-01",
         "content-type": "application/json",
     }
 
-    payload = {
+
+def _anthropic_params(system_prompt: str, user_prompt: str) -> dict:
+    return {
         "model": ANTHROPIC_MODEL,
         "max_tokens": MAX_TOKENS,
         "system": system_prompt,
@@ -340,13 +653,22 @@ def call_anthropic(system_prompt: str, user_prompt: str, api_key: str) -> str:
         ],
     }
 
+
+def call_anthropic(system_prompt: str, user_prompt: str, api_key: str) -> str:
+    """Call Anthropic Claude API."""
+    headers = _anthropic_headers(api_key)
+    payload = _anthropic_params(system_prompt, user_prompt)
+
     try:
-        resp = requests.post(ANTHROPIC_URL, headers=headers, json=payload, timeout=120)
+        with ANTHROPIC_LIMITER.reserve(_estimate_tokens(system_prompt, user_prompt)):
+            resp = SESSION.post(ANTHROPIC_URL, headers=headers, data=_json_dumps(payload),
+                                timeout=120)
         resp.raise_for_status()
-        data = resp.json()
+        data = _json_loads(resp.content)
         return data["content"][0]["text"]
-    except requests.RequestException as e:
+    except (requests.RequestException, ValueError) as e:
         print(f"WARNING: Anthropic API call failed: {e}", file=sys.stderr)
+        _handle_rate_limit(ANTHROPIC_LIMITER, e)
         if hasattr(e, "response") and e.response is not None:
             print(f"  Response: {e.response.text[:500]}", file=sys.stderr)
         return None
@@ -369,12 +691,15 @@ def call_openai(system_prompt: str, user_prompt: str, api_key: str) -> str:
     }
 
     try:
-        resp = requests.post(OPENAI_URL, headers=headers, json=payload, timeout=120)
+        with OPENAI_LIMITER.reserve(_estimate_tokens(system_prompt, user_prompt)):
+            resp = SESSION.post(OPENAI_URL, headers=headers, data=_json_dumps(payload),
+                                timeout=120)
         resp.raise_for_status()
-        data = resp.json()
+        data = _json_loads(resp.content)
         return data["choices"][0]["message"]["content"]
-    except requests.RequestException as e:
+    except (requests.RequestException, ValueError) as e:
         print(f"WARNING: OpenAI API call failed: {e}", file=sys.stderr)
+        _handle_rate_limit(OPENAI_LIMITER, e)
         if hasattr(e, "response") and e.response is not None:
             print(f"  Response: {e.response.text[:500]}", file=sys.stderr)
         return None
@@ -383,6 +708,10 @@ def call_openai(system_prompt: str, user_prompt: str, api_key: str) -> str:
 def generate_threat_path(system_prompt: str, user_prompt: str) -> tuple[str, str]:
     """
     Call LLM with fallback chain. Returns (response_text, model_used).
+
+    Providers are started in order. The fallback is started as soon as
+    the previous provider fails, or as a hedge once it has been pending
+    for HEDGE_DELAY_SECONDS; the first successful response wins.
     """
     anthropic_key = os.environ.get("ANTHROPIC_API_KEY", "").strip()
     openai_key = os.environ.get("OPENAI_API_KEY", "").strip()
@@ -391,43 +720,193 @@ def generate_threat_path(system_prompt: str, user_prompt: str) -> tuple[str, str
         print("ERROR: No API keys found. Set ANTHROPIC_API_KEY or OPENAI_API_KEY.", file=sys.stderr)
         sys.exit(1)
 
-    # Try Anthropic first
+    providers = []
     if anthropic_key:
-        print(f"Calling {ANTHROPIC_MODEL}...", file=sys.stderr)
-        result = call_anthropic(system_prompt, user_prompt, anthropic_key)
-        if result:
-            return result, ANTHROPIC_MODEL
-
-    # Fallback to OpenAI
+        providers.append((ANTHROPIC_MODEL, call_anthropic, anthropic_key))
     if openai_key:
-        print(f"Calling {OPENAI_MODEL} (fallback)...", file=sys.stderr)
-        result = call_openai(system_prompt, user_prompt, openai_key)
-        if result:
-            return result, OPENAI_MODEL
+        providers.append((OPENAI_MODEL, call_openai, openai_key))
+
+    results: queue.Queue = queue.Queue()
+
+    def _worker(model, call, api_key):
+        # Always report back: a thread that dies without putting a result
+        # would leave the wait on the last provider blocked forever
+        try:
+            result = call(system_prompt, user_prompt, api_key)
+        except Exception as e:
+            print(f"WARNING: {model} call raised {type(e).__name__}: {e}", file=sys.stderr)
+            result = None
+        results.put((model, result))
+
+    pending = 0
+    for i, (model, call, api_key) in enumerate(providers):
+        suffix = " (fallback)" if i else ""
+        print(f"Calling {model}{suffix}...", file=sys.stderr)
+        # Daemon threads so a losing request never delays process exit
+        threading.Thread(target=_worker, args=(model, call, api_key), daemon=True).start()
+        pending += 1
+
+        is_last = i == len(providers) - 1
+        deadline = None if is_last else time.monotonic() + HEDGE_DELAY_SECONDS
+        while pending:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                done_model, result = results.get(timeout=timeout)
+            except queue.Empty:
+                print(f"{model} still pending after {HEDGE_DELAY_SECONDS}s, "
+                      f"hedging with next provider", file=sys.stderr)
+                break
+            pending -= 1
+            if result:
+                return result, done_model
+            if not is_last:
+                break
 
     print("ERROR: All LLM API calls failed.", file=sys.stderr)
     sys.exit(1)
 
 
+def _response_cache_path(system_prompt: str, intake: dict[str, str]) -> Path:
+    """Cache file for a system prompt plus the article and intake metadata.
+
+    ``intake`` must not include the TP ID or date, which change between
+    runs for the same article.
+    """
+    parts = [system_prompt] + [f"{k}={intake[k]}" for k in sorted(intake)]
+    key = hashlib.blake2b(
+        b"\0".join(part.encode("utf-8") for part in parts),
+        digest_size=20,
+    ).hexdigest()
+    return CACHE_DIR / f"{key}.json"
+
+
+def _restamp_cached(cached: dict, tp_id: str, today: str) -> str:
+    """Move a cached response over to this run's TP ID and date."""
+    text = cached["text"]
+    old_id, old_date = cached.get("tp_id"), cached.get("date")
+    if old_id:
+        text = text.replace(old_id, tp_id)
+    if old_date:
+        # Revision History rows; other dates in the body are left alone
+        text = text.replace(f"| {old_date} |", f"| {today} |")
+    text = FRONTMATTER_DATE_RE.sub(rf"\g<1>{today}", text, count=1)
+    return assign_tp_id(text, tp_id)
+
+
+def cached_generate_threat_path(system_prompt: str, user_prompt: str,
+                                tp_id: str, today: str, intake: dict[str, str],
+                                use_cache: bool = True) -> tuple[str, str]:
+    """generate_threat_path with an on-disk cache under .cache/ai_intake.
+
+    Entries are keyed by the system prompt, the article text and the
+    intake metadata in ``intake`` (author, source URL, sector, fraud
+    types, context). The TP ID and date are not part of the key, so
+    re-running intake for the same article on a later day, or after its
+    first TP file was written, reuses the stored response. The response
+    is restamped with this run's ID and date. In CI the directory is kept
+    between runs with actions/cache.
+    """
+    cache_path = _response_cache_path(system_prompt, intake)
+    if use_cache and cache_path.exists():
+        try:
+            cached = _json_loads(cache_path.read_bytes())
+            text = _restamp_cached(cached, tp_id, today)
+            print(f"Using cached response ({cache_path.name})", file=sys.stderr)
+            return text, cached["model"]
+        except (ValueError, KeyError, TypeError):
+            print(f"WARNING: Ignoring unreadable cache entry {cache_path.name}", file=sys.stderr)
+
+    text, model = generate_threat_path(system_prompt, user_prompt)
+
+    if use_cache:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_path.write_bytes(_json_dumps(
+            {"model": model, "text": text, "tp_id": tp_id, "date": today}))
+    return text, model
+
+
 # ---------------------------------------------------------------------------
-# Post-processing
+# Batch intake (Anthropic Message Batches API)
 # ---------------------------------------------------------------------------
 
-def extract_title_from_output(content: str) -> str:
-    """Extract the title from the generated markdown."""
-    for line in content.split("\n"):
-        line = line.strip()
-        if line.startswith("# TP-"):
-            # Remove the "# TP-XXXX: " prefix
-            match = re.match(r"#\s+TP-\d{4}:\s*(.+)", line)
-            if match:
-                return match.group(1).strip()
-    return "untitled"
+def _require_anthropic_key() -> str:
+    api_key = os.environ.get("ANTHROPIC_API_KEY", "").strip()
+    if not api_key:
+        print("ERROR: Batch mode requires ANTHROPIC_API_KEY.", file=sys.stderr)
+        sys.exit(1)
+    return api_key
+
+
+def submit_batch(prompts: list[dict]) -> str:
+    """Submit prompts as one Message Batch and return the batch ID.
+
+    Each prompt dict needs ``custom_id`` (an opaque per-request key),
+    ``system`` and ``user``; any other keys are kept in the local batch
+    manifest so --collect can report them.
+    """
+    api_key = _require_anthropic_key()
+    payload = {
+        "requests": [
+            {"custom_id": p["custom_id"], "params": _anthropic_params(p["system"], p["user"])}
+            for p in prompts
+        ],
+    }
+
+    try:
+        resp = SESSION.post(ANTHROPIC_BATCHES_URL, headers=_anthropic_headers(api_key),
+                            data=_json_dumps(payload), timeout=120)
+        resp.raise_for_status()
+        batch_id = _json_loads(resp.content)["id"]
+    except (requests.RequestException, ValueError, KeyError) as e:
+        print(f"ERROR: Batch submission failed: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    manifest = [{k: v for k, v in p.items() if k not in ("system", "user")} for p in prompts]
+    BATCH_MANIFEST_DIR.mkdir(parents=True, exist_ok=True)
+    (BATCH_MANIFEST_DIR / f"{batch_id}.json").write_bytes(_json_dumps(manifest))
+    return batch_id
 
 
-def clean_output(content: str) -> str:
+def collect_batch(batch_id: str) -> dict[str, str] | None:
+    """Download a finished batch. Returns {custom_id: text}, or None if still running."""
+    api_key = _require_anthropic_key()
+    headers = _anthropic_headers(api_key)
+
+    try:
+        resp = SESSION.get(f"{ANTHROPIC_BATCHES_URL}/{batch_id}", headers=headers, timeout=30)
+        resp.raise_for_status()
+        batch = _json_loads(resp.content)
+        if batch.get("processing_status") != "ended":
+            print(f"Batch {batch_id} is {batch.get('processing_status')}", file=sys.stderr)
+            return None
+
+        resp = SESSION.get(batch["results_url"], headers=headers, timeout=120)
+        resp.raise_for_status()
+    except (requests.RequestException, ValueError, KeyError) as e:
+        print(f"ERROR: Batch collection failed: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    outputs = {}
+    for line in resp.content.splitlines():
+        if not line.strip():
+            continue
+        item = _json_loads(line)
+        result = item.get("result", {})
+        if result.get("type") != "succeeded":
+            print(f"WARNING: {item.get('custom_id')} did not succeed: {result.get('type')}",
+                  file=sys.stderr)
+            continue
+        outputs[item["custom_id"]] = result["message"]["content"][0]["text"]
+    return outputs
+
+
+# ---------------------------------------------------------------------------
+# Post-processing
+# ---------------------------------------------------------------------------
+
+def clean_output(content: str) -> tuple[str, str]:
     """
-    Clean up LLM output.
+    Clean up LLM output. Returns (content, title).
     Ensures the content follows FLAME's specific format:
     1. Title line (# TP-XXXX: ...)
     2. YAML frontmatter wrapped in ```yaml ... ``` code block
@@ -435,15 +914,13 @@ def clean_output(content: str) -> str:
     content = content.strip()
 
     # 1. Remove wrapping ```markdown ... ``` if the LLM enclosed the whole file
-    if content.startswith("```markdown") or content.startswith("```md"):
-        lines = content.splitlines()
-        # Remove first line if it's the fence
-        if lines[0].startswith("```"):
-            lines = lines[1:]
-        # Remove last line if it's closing fence
-        if lines and lines[-1].strip() == "```":
-            lines = lines[:-1]
-        content = "\n".join(lines).strip()
+    if content.startswith(("```markdown", "```md")):
+        # Drop the opening fence line, then the closing fence line if present
+        _, _, content = content.partition("\n")
+        head, _, last = content.rpartition("\n")
+        if last.strip() == "```":
+            content = head
+        content = content.strip()
 
     # 2. Ensure frontmatter is wrapped in ```yaml
     # The validator requires:
@@ -452,97 +929,41 @@ def clean_output(content: str) -> str:
     # ...
     # ---
     # ```
-    
-    # Check if we have a YAML block
+    # If the LLM output raw YAML between --- delimiters, wrap the first
+    # such block (the title line before it is left alone).
     if "```yaml" not in content:
-        # If the LLM output raw YAML (starting with ---), wrap it
-        # But be careful not to wrap the Title line if it's first!
-        
-        lines = content.splitlines()
-        new_lines = []
-        in_yaml = False
-        yaml_started = False
-        
-        for i, line in enumerate(lines):
-            if line.strip() == "---":
-                if not in_yaml:
-                    if not yaml_started:
-                        # Start of YAML block
-                        new_lines.append("```yaml")
-                        new_lines.append("---")
-                        in_yaml = True
-                        yaml_started = True
-                    else:
-                        # This shouldn't happen for standard frontmatter 
-                        # unless there are multiple --- blocks?
-                        new_lines.append(line)
-                else:
-                    # End of YAML block
-                    new_lines.append("---")
-                    new_lines.append("```")
-                    in_yaml = False
-            else:
-                new_lines.append(line)
-        
-        if yaml_started:
-            content = "\n".join(new_lines)
-
-    return content
+        content = RAW_FRONTMATTER_RE.sub(r"```yaml\n---\n\1---\n```", content, count=1)
+
+    # 3. Extract the title for the filename
+    match = TITLE_RE.search(content)
+    title = match.group(1).strip() if match else "untitled"
+
+    return content, title
 
 
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
 
-def main():
-    parser = argparse.ArgumentParser(description="FLAME AI Intake — generate threat path from URL")
-    parser.add_argument("--url", required=True, help="Source URL to analyze")
-    parser.add_argument("--author", default="FLAME AI Intake", help="Author name")
-    parser.add_argument("--sector", default="cross-sector", help="Primary sector")
-    parser.add_argument("--fraud-types", default="", help="Comma-separated fraud types")
-    parser.add_argument("--context", default="", help="Additional context for the AI")
-    parser.add_argument("--output-dir", default="ThreatPaths", help="Output directory")
-    args = parser.parse_args()
+def assign_tp_id(content: str, tp_id: str) -> str:
+    """Stamp ``tp_id`` into the title line and frontmatter ``id`` field.
 
-    # Fetch article
-    print(f"Fetching: {args.url}", file=sys.stderr)
-    article_text = fetch_url_content(args.url)
-    print(f"Fetched {len(article_text)} characters", file=sys.stderr)
+    Also replaces any remaining batch placeholder ID in the body.
+    """
+    content = TITLE_ID_RE.sub(rf"\g<1>{tp_id}", content, count=1)
+    content = FRONTMATTER_ID_RE.sub(rf"\g<1>{tp_id}", content, count=1)
+    return content.replace(BATCH_TP_ID_PLACEHOLDER, tp_id)
 
-    # Determine next TP ID
-    tp_id = get_next_tp_id()
-    today = date.today().isoformat()
-    print(f"Assigning ID: {tp_id}", file=sys.stderr)
-
-    # Load CFPF reference
-    cfpf_ref = load_cfpf_techniques()
-
-    # Build prompts
-    system_prompt = build_system_prompt(cfpf_ref)
-    user_prompt = build_user_prompt(
-        tp_id=tp_id,
-        today=today,
-        author=args.author,
-        source_url=args.url,
-        sector=args.sector,
-        fraud_types=args.fraud_types,
-        context=args.context,
-        article_text=article_text,
-    )
 
-    # Generate
-    print("Generating threat path...", file=sys.stderr)
-    raw_output, model_used = generate_threat_path(system_prompt, user_prompt)
-    content = clean_output(raw_output)
-    print(f"Generated by: {model_used}", file=sys.stderr)
+def write_threat_path(raw_output: str, tp_id: str, output_dir: Path) -> dict:
+    """Clean an LLM response, write it to disk and return summary fields."""
+    content, title = clean_output(raw_output)
 
-    # Extract title for filename
-    title = extract_title_from_output(content)
+    # Build filename from the title
     slug = slugify(title)
     filename = f"{tp_id}-{slug}.md" if slug else f"{tp_id}-untitled.md"
 
     # Write output
-    output_dir = REPO_ROOT / args.output_dir
     output_dir.mkdir(parents=True, exist_ok=True)
     output_path = output_dir / filename
 
@@ -553,18 +974,151 @@ def main():
 
     print(f"Written: {output_path.relative_to(REPO_ROOT)}", file=sys.stderr)
 
-    # Output JSON summary to stdout for the GitHub Action to consume
-    summary = {
+    return {
         "tp_id": tp_id,
         "title": title,
         "filename": filename,
         "filepath": str(output_path.relative_to(REPO_ROOT)),
-        "model": model_used,
-        "source_url": args.url,
-        "article_length": len(article_text),
     }
-    print(json.dumps(summary))
 
+
+def main():
+    parser = argparse.ArgumentParser(description="FLAME AI Intake — generate threat path from URL")
+    parser.add_argument("--url", action="append", default=[],
+                        help="Source URL to analyze (repeat with --batch)")
+    parser.add_argument("--author", default="FLAME AI Intake", help="Author name")
+    parser.add_argument("--sector", default="cross-sector", help="Primary sector")
+    parser.add_argument("--fraud-types", default="", help="Comma-separated fraud types")
+    parser.add_argument("--context", default="", help="Additional context for the AI")
+    parser.add_argument("--output-dir", default="ThreatPaths", help="Output directory")
+    parser.add_argument("--batch", action="store_true",
+                        help="Submit all URLs as one Anthropic Message Batch instead of calling the API directly")
+    parser.add_argument("--collect", metavar="BATCH_ID",
+                        help="Write threat paths from a finished batch")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always call the LLM instead of reusing a cached response")
+    args = parser.parse_args()
+
+    output_dir = REPO_ROOT / args.output_dir
+
+    if args.collect:
+        return collect_main(args.collect, output_dir)
+    if not args.url:
+        parser.error("--url is required unless --collect is given")
+    if len(args.url) > 1 and not args.batch:
+        parser.error("multiple --url values require --batch")
+
+    today = date.today().isoformat()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+        # Fetch articles in the background while the prompt is assembled
+        for url in args.url:
+            print(f"Fetching: {url}", file=sys.stderr)
+        article_futures = [executor.submit(fetch_url_content, url) for url in args.url]
+
+        # Batch results arrive hours later, so their IDs are assigned on
+        # --collect; reserving them now would collide with other intakes
+        tp_id = BATCH_TP_ID_PLACEHOLDER if args.batch else get_next_tp_id()
+
+        # Load CFPF reference
+        cfpf_ref = load_cfpf_techniques()
+        system_prompt = build_system_prompt(cfpf_ref)
+
+        article_texts = [f.result() for f in article_futures]
+
+    prompts = []
+    for index, (url, article_text) in enumerate(zip(args.url, article_texts)):
+        print(f"Fetched {len(article_text)} characters from {url}", file=sys.stderr)
+
+        if not args.batch:
+            print(f"Assigning ID: {tp_id}", file=sys.stderr)
+
+        user_prompt = build_user_prompt(
+            tp_id=tp_id,
+            today=today,
+            author=args.author,
+            source_url=url,
+            sector=args.sector,
+            fraud_types=args.fraud_types,
+            context=args.context,
+            article_text=article_text,
+        )
+        prompts.append({
+            "custom_id": f"request-{index}",
+            "system": system_prompt,
+            "user": user_prompt,
+            "source_url": url,
+            "article_length": len(article_text),
+        })
+
+    if args.batch:
+        batch_id = submit_batch(prompts)
+        print(f"Submitted batch: {batch_id}", file=sys.stderr)
+        print(_json_dumps({
+            "batch_id": batch_id,
+            "custom_ids": [p["custom_id"] for p in prompts],
+        }).decode("utf-8"))
+        return 0
+
+    # Generate
+    prompt = prompts[0]
+    print("Generating threat path...", file=sys.stderr)
+    intake = {
+        "author": args.author,
+        "source_url": prompt["source_url"],
+        "sector": args.sector,
+        "fraud_types": args.fraud_types,
+        "context": args.context,
+        "article_text": article_texts[0],
+    }
+    raw_output, model_used = cached_generate_threat_path(
+        prompt["system"], prompt["user"], tp_id, today, intake,
+        use_cache=not args.no_cache)
+    print(f"Generated by: {model_used}", file=sys.stderr)
+
+    # Output JSON summary to stdout for the GitHub Action to consume
+    summary = write_threat_path(raw_output, tp_id, output_dir)
+    summary.update({
+        "model": model_used,
+        "source_url": prompt["source_url"],
+        "article_length": prompt["article_length"],
+    })
+    print(_json_dumps(summary).decode("utf-8"))
+
+    return 0
+
+
+def collect_main(batch_id: str, output_dir: Path) -> int:
+    """Write every succeeded request of a finished batch as a threat path.
+
+    TP IDs are assigned here, at write time, in submission order, so
+    intakes run while the batch was pending keep their IDs.
+    """
+    outputs = collect_batch(batch_id)
+    if outputs is None:
+        return 2
+
+    manifest_path = BATCH_MANIFEST_DIR / f"{batch_id}.json"
+    manifest = _json_loads(manifest_path.read_bytes()) if manifest_path.exists() else []
+    meta = {m["custom_id"]: m for m in manifest}
+    # Manifest order is submission order; unknown IDs (no manifest) go last
+    order = {custom_id: i for i, custom_id in enumerate(meta)}
+
+    next_num = int(get_next_tp_id()[3:])
+    summaries = []
+    for custom_id in sorted(outputs, key=lambda c: (order.get(c, len(order)), c)):
+        tp_id = f"TP-{next_num:04d}"
+        next_num += 1
+        print(f"Assigning ID: {tp_id} ({custom_id})", file=sys.stderr)
+        raw_output = assign_tp_id(outputs[custom_id], tp_id)
+        summary = write_threat_path(raw_output, tp_id, output_dir)
+        summary["model"] = ANTHROPIC_MODEL
+        if custom_id in meta:
+            summary["source_url"] = meta[custom_id]["source_url"]
+            summary["article_length"] = meta[custom_id]["article_length"]
+        summaries.append(summary)
+
+    print(_json_dumps(summaries).decode("utf-8"))
     return 0
 
 
@@ -7,32 +7,56 @@ builds a SQLite index database and exports a JSON data file
 for the static frontend.
 
 Usage:
-    python scripts/build_database.py [--root /path/to/flame-fraud]
+    python scripts/build_database.py [--root /path/to/flame-fraud] [--no-cache]
 
 The script scans ThreatPaths/, Baselines/, and DetectionLogic/
 directories for markdown files, parses their YAML frontmatter
 (code-fenced blocks), and produces:
     - database/flame.db    (SQLite index)
     - database/flame-data.json (flat JSON for frontend)
+
+Parsed files are cached in .cache/build_database.json keyed by path,
+mtime and size, so unchanged files are not re-parsed on the next run.
 """
 
 import argparse
 import csv
+import hashlib
 import json
 import logging
 import os
 import re
 import sqlite3
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 
 try:
     import yaml
 except ImportError:
-    print("ERROR: pyyaml is required. Install with: pip install pyyaml", file=sys.stderr)
+    print("ERROR: pyyaml is required. Install with: pip install pyyaml "
+          "(a build linked against libyaml enables the fast CSafeLoader)", file=sys.stderr)
     sys.exit(1)
 
+try:
+    import re2 as _frontmatter_re
+except ImportError:
+    _frontmatter_re = re
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Use the libyaml C loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(levelname)s: %(message)s"
@@ -43,27 +67,35 @@ log = logging.getLogger("build_database")
 # Frontmatter extraction
 # ---------------------------------------------------------------------------
 
-# Matches code-fenced YAML blocks: ```yaml ... ``` with --- delimiters inside
-FRONTMATTER_PATTERN = re.compile(
-    r"```ya?ml\s*\n---\s*\n(.*?)\n---\s*\n```",
-    re.DOTALL
+# Matches code-fenced YAML blocks: ```yaml ... ``` with --- delimiters inside.
+# Compiled with RE2 (linear-time, no backtracking) when google-re2 is installed;
+# the inline (?s) flag keeps the pattern portable between both engines.
+FRONTMATTER_PATTERN = _frontmatter_re.compile(
+    r"(?s)```ya?ml\s*\n---\s*\n(.*?)\n---\s*\n```"
 )
 
 
-def extract_frontmatter(filepath: Path) -> dict | None:
-    """Extract YAML frontmatter from a markdown file.
+def _search_frontmatter(text: str):
+    """Find the frontmatter block, or None.
 
-    Supports the FLAME convention where frontmatter is wrapped in
-    a code-fenced yaml block with --- delimiters.
+    A plain substring scan locates the first candidate fence, so files
+    without one never reach the regex, and the regex starts at the fence
+    instead of probing every earlier position.
     """
-    text = filepath.read_text(encoding="utf-8")
-    match = FRONTMATTER_PATTERN.search(text)
+    start = text.find("```y")
+    if start == -1:
+        return None
+    return FRONTMATTER_PATTERN.search(text, start)
+
+
+def _load_frontmatter(match: re.Match | None, filepath: Path) -> dict | None:
+    """Parse the YAML captured by FRONTMATTER_PATTERN, logging failures."""
     if not match:
         log.warning("No frontmatter found in %s", filepath)
         return None
 
     try:
-        data = yaml.safe_load(match.group(1))
+        data = yaml.load(match.group(1), Loader=SafeLoader)
     except yaml.YAMLError as e:
         log.error("YAML parse error in %s: %s", filepath, e)
         return None
@@ -75,33 +107,77 @@ def extract_frontmatter(filepath: Path) -> dict | None:
     return data
 
 
+def _body_after(text: str, match: re.Match | None) -> str:
+    """Return the text following the frontmatter block (or all of it)."""
+    if match:
+        # The pattern ends on the closing ``` of the frontmatter
+        return text[match.end():].strip()
+    return text.strip()
+
+
+def _read_markdown(filepath: Path) -> str:
+    """Read a markdown file as text with one bytes decode.
+
+    Line endings are normalised the way read_text's universal newlines
+    would, but only when the file actually contains a carriage return.
+    """
+    text = filepath.read_bytes().decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def extract_frontmatter(filepath: Path) -> dict | None:
+    """Extract YAML frontmatter from a markdown file.
+
+    Supports the FLAME convention where frontmatter is wrapped in
+    a code-fenced yaml block with --- delimiters.
+    """
+    text = _read_markdown(filepath)
+    return _load_frontmatter(_search_frontmatter(text), filepath)
+
+
 def extract_body(filepath: Path) -> str:
     """Extract the body content after the frontmatter block."""
-    text = filepath.read_text(encoding="utf-8")
-    match = FRONTMATTER_PATTERN.search(text)
-    if match:
-        # Everything after the closing ``` of the frontmatter
-        end = text.find("```", match.end() - 3) + 3
-        body = text[end:].strip()
-    else:
-        body = text.strip()
-    return body
+    text = _read_markdown(filepath)
+    return _body_after(text, _search_frontmatter(text))
+
+
+def parse_markdown(filepath: Path) -> tuple[dict | None, str, str, list[dict]]:
+    """Read a submission once and return (meta, body, summary, evidence).
+
+    ``meta`` is None when the frontmatter is missing or invalid, in which
+    case the other fields are empty.
+    """
+    text = _read_markdown(filepath)
+    match = _search_frontmatter(text)
+    meta = _load_frontmatter(match, filepath)
+    if meta is None:
+        return None, "", "", []
+    body = _body_after(text, match)
+    return meta, body, extract_summary(body), extract_evidence(body)
+
+
+# Section headings; callers gate on str.startswith("##") before matching
+SECTION_HEADING = re.compile(r"##\s+")
+EVIDENCE_HEADING = re.compile(r"##\s+Operational Evidence")
+# Line-anchored forms for slicing a whole body ([^\S\n] keeps a match on one line)
+SUMMARY_LINE = re.compile(r"^##[^\S\n]+Summary", re.MULTILINE)
+SECTION_LINE = re.compile(r"^##[^\S\n]+", re.MULTILINE)
+EVIDENCE_LINE = re.compile(r"^[^\S\n]*##[^\S\n]+Operational Evidence", re.MULTILINE)
 
 
 def extract_summary(body: str) -> str:
     """Extract the Summary section content from the body."""
-    lines = body.split("\n")
-    capture = False
-    summary_lines = []
-    for line in lines:
-        if re.match(r"^##\s+Summary", line):
-            capture = True
-            continue
-        if capture:
-            if re.match(r"^##\s+", line):
-                break
-            summary_lines.append(line)
-    return "\n".join(summary_lines).strip()
+    header = SUMMARY_LINE.search(body)
+    if not header:
+        return ""
+    start = body.find("\n", header.end())
+    if start == -1:
+        return ""
+    boundary = SECTION_LINE.search(body, start)
+    end = boundary.start() if boundary else len(body)
+    return body[start:end].strip()
 
 
 # Evidence ID pattern: ### EV-TPXXXX-YYYY-NNN: Title
@@ -116,31 +192,35 @@ def extract_evidence(body: str) -> list[dict]:
     Parses the ## Operational Evidence section for structured evidence
     entries identified by ### EV-* headers with bullet-point fields.
     """
-    lines = body.split("\n")
-    in_section = False
+    # Skip straight to the section instead of scanning every earlier line
+    heading = EVIDENCE_LINE.search(body)
+    if not heading:
+        return []
+    start = body.find("\n", heading.end())
+    if start == -1:
+        return []
+
     entries = []
     current = None
 
-    for line in lines:
+    for line in body[start + 1:].split("\n"):
         stripped = line.strip()
 
-        # Detect entering the Operational Evidence section
-        if re.match(r"^##\s+Operational Evidence", stripped):
-            in_section = True
+        is_heading = stripped.startswith("##")
+
+        # A repeated Operational Evidence heading does not end the section
+        if is_heading and EVIDENCE_HEADING.match(stripped):
             continue
 
         # Detect leaving the section (next ## heading)
-        if in_section and re.match(r"^##\s+", stripped) and not re.match(r"^###", stripped):
+        if is_heading and not stripped.startswith("###") and SECTION_HEADING.match(stripped):
             if current:
                 entries.append(current)
                 current = None
             break
 
-        if not in_section:
-            continue
-
         # Check for evidence entry header
-        header_match = EVIDENCE_HEADER.match(stripped)
+        header_match = EVIDENCE_HEADER.match(stripped) if stripped.startswith("###") else None
         if header_match:
             if current:
                 entries.append(current)
@@ -151,7 +231,7 @@ def extract_evidence(body: str) -> list[dict]:
             continue
 
         # Check for field within current entry
-        if current:
+        if current and stripped.startswith("-"):
             field_match = EVIDENCE_FIELD.match(stripped)
             if field_match:
                 key = field_match.group(1).lower().replace(" ", "_")
@@ -168,7 +248,7 @@ def extract_evidence(body: str) -> list[dict]:
 # Database schema
 # ---------------------------------------------------------------------------
 
-SCHEMA = """
+SCHEMA_TABLES = """
 CREATE TABLE IF NOT EXISTS submissions (
     id TEXT PRIMARY KEY,
     title TEXT NOT NULL,
@@ -240,11 +320,6 @@ CREATE TABLE IF NOT EXISTS techniques (
     fraud_types TEXT
 );
 
-CREATE INDEX IF NOT EXISTS idx_sectors ON submission_sectors(sector);
-CREATE INDEX IF NOT EXISTS idx_fraud_types ON submission_fraud_types(fraud_type);
-CREATE INDEX IF NOT EXISTS idx_cfpf ON submission_cfpf_phases(phase);
-CREATE INDEX IF NOT EXISTS idx_tags ON submission_tags(tag);
-
 CREATE TABLE IF NOT EXISTS regulatory_alerts (
     alert_id TEXT PRIMARY KEY,
     source TEXT NOT NULL,
@@ -267,71 +342,144 @@ CREATE TABLE IF NOT EXISTS submission_ucff_domains (
     domains_json TEXT NOT NULL,
     FOREIGN KEY (submission_id) REFERENCES submissions(id)
 );
+"""
+
+# Created after the bulk load so inserts do not maintain them row by row
+SCHEMA_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_submissions_cat_lower ON submissions(lower(category));
+CREATE INDEX IF NOT EXISTS idx_sectors ON submission_sectors(sector, submission_id);
+CREATE INDEX IF NOT EXISTS idx_fraud_types ON submission_fraud_types(fraud_type, submission_id);
+CREATE INDEX IF NOT EXISTS idx_cfpf ON submission_cfpf_phases(phase);
+CREATE INDEX IF NOT EXISTS idx_tags ON submission_tags(tag);
+
+-- Covering (submission_id, value) indexes for per-submission lookups
+CREATE INDEX IF NOT EXISTS idx_sectors_sub ON submission_sectors(submission_id, sector);
+CREATE INDEX IF NOT EXISTS idx_fraud_types_sub ON submission_fraud_types(submission_id, fraud_type);
+CREATE INDEX IF NOT EXISTS idx_tags_sub ON submission_tags(submission_id, tag);
+CREATE INDEX IF NOT EXISTS idx_cfpf_sub ON submission_cfpf_phases(submission_id, phase);
+CREATE INDEX IF NOT EXISTS idx_mitre_attack_sub ON submission_mitre_attack(submission_id, technique_id);
+CREATE INDEX IF NOT EXISTS idx_ft3_tactics_sub ON submission_ft3_tactics(submission_id, tactic_id);
+CREATE INDEX IF NOT EXISTS idx_mitre_f3_sub ON submission_mitre_f3(submission_id, technique_id);
+CREATE INDEX IF NOT EXISTS idx_groupib_stages_sub ON submission_groupib_stages(submission_id, stage);
 
 CREATE INDEX IF NOT EXISTS idx_reg_source ON regulatory_alerts(source);
 CREATE INDEX IF NOT EXISTS idx_reg_date ON regulatory_alerts(date);
 CREATE INDEX IF NOT EXISTS idx_reg_tp ON regulatory_alert_tp_mapping(tp_id);
+CREATE INDEX IF NOT EXISTS idx_reg_alert ON regulatory_alert_tp_mapping(alert_id);
+CREATE INDEX IF NOT EXISTS idx_ucff_sub ON submission_ucff_domains(submission_id);
+"""
+
+
+# The database is rebuilt from scratch on every run and only this process
+# touches it, so durability of intermediate states does not matter: no
+# fsyncs, and one exclusive lock for the whole build. WAL is avoided because
+# the journal mode is persisted in the committed flame.db file.
+PRAGMAS = """
+PRAGMA journal_mode = MEMORY;
+PRAGMA synchronous = OFF;
+PRAGMA temp_store = MEMORY;
+PRAGMA locking_mode = EXCLUSIVE;
+PRAGMA cache_size = -65536;
 """
 
 
 def init_database(db_path: Path) -> sqlite3.Connection:
-    """Create or recreate the database with the schema."""
+    """Create or recreate the database with the table schema.
+
+    Indexes are added by create_indexes once the data is loaded.
+    """
     if db_path.exists():
         db_path.unlink()
     db_path.parent.mkdir(parents=True, exist_ok=True)
 
-    conn = sqlite3.connect(str(db_path))
-    conn.executescript(SCHEMA)
-    conn.commit()
+    # Autocommit mode: writes are grouped explicitly with transaction().
+    # Larger statement cache so per-row INSERTs and bulk-insert chunk shapes
+    # stay prepared across the whole build.
+    conn = sqlite3.connect(str(db_path), isolation_level=None, cached_statements=256)
+    conn.executescript(PRAGMAS)
+    # executescript commits any open transaction, so the DDL brings its own
+    conn.executescript("BEGIN;\n" + SCHEMA_TABLES + "COMMIT;")
     return conn
 
 
+@contextmanager
+def transaction(conn: sqlite3.Connection):
+    """Run the block inside one explicit BEGIN/COMMIT, rolling back on error.
+
+    Joins the caller's transaction if one is already open.
+    """
+    if conn.in_transaction:
+        yield conn
+        return
+    conn.execute("BEGIN")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
+def create_indexes(conn: sqlite3.Connection):
+    """Build all secondary indexes in one pass and refresh planner statistics."""
+    conn.executescript("BEGIN;\n" + SCHEMA_INDEXES + "ANALYZE;\nCOMMIT;")
+
+
 # ---------------------------------------------------------------------------
 # Data loading
 # ---------------------------------------------------------------------------
 
-def load_submission(conn: sqlite3.Connection, meta: dict, body: str, summary: str, filepath: Path):
-    """Insert a single submission and its related data into the database."""
+# Hot-path statement, kept as a constant so the connection's statement
+# cache always sees the identical SQL text
+INSERT_TECHNIQUE_SQL = """INSERT OR REPLACE INTO techniques
+    (id, phase, name, description, indicators, mitre_attack, fraud_types)
+    VALUES (?, ?, ?, ?, ?, ?, ?)"""
+
+SUBMISSION_COLUMNS = (
+    "id", "title", "category", "date", "author", "source", "tlp", "summary", "body", "file_path",
+)
+
+
+def load_submission(conn: sqlite3.Connection, meta: dict, body: str, summary: str, filepath: Path,
+                    pending: dict | None = None):
+    """Insert a single submission and its related data into the database.
+
+    When ``pending`` is given, rows are queued there instead (see _queue_rows)
+    and written for all submissions at once by _flush_pending.
+    """
     sub_id = meta.get("id", "")
     if not sub_id:
         log.warning("Skipping %s: no 'id' in frontmatter", filepath)
         return
 
-    conn.execute(
-        """INSERT OR REPLACE INTO submissions
-           (id, title, category, date, author, source, tlp, summary, body, file_path)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-        (
-            sub_id,
-            meta.get("title", ""),
-            meta.get("category", ""),
-            str(meta.get("date", "")),
-            meta.get("author", ""),
-            meta.get("source", ""),
-            meta.get("tlp", "WHITE"),
-            summary,
-            body,
-            str(filepath),
-        )
-    )
+    _queue_rows(conn, pending, "submissions", SUBMISSION_COLUMNS, [(
+        sub_id,
+        meta.get("title", ""),
+        meta.get("category", ""),
+        str(meta.get("date", "")),
+        meta.get("author", ""),
+        meta.get("source", ""),
+        meta.get("tlp", "WHITE"),
+        summary,
+        body,
+        str(filepath),
+    )])
 
     # Multi-value fields
-    _insert_multi(conn, "submission_sectors", sub_id, "sector", meta.get("sector", []))
-    _insert_multi(conn, "submission_fraud_types", sub_id, "fraud_type", meta.get("fraud_types", []))
-    _insert_multi(conn, "submission_tags", sub_id, "tag", meta.get("tags", []))
-    _insert_multi(conn, "submission_cfpf_phases", sub_id, "phase", meta.get("cfpf_phases", []))
-    _insert_multi(conn, "submission_mitre_attack", sub_id, "technique_id", meta.get("mitre_attack", []))
-    _insert_multi(conn, "submission_ft3_tactics", sub_id, "tactic_id", meta.get("ft3_tactics", []))
-    _insert_multi(conn, "submission_mitre_f3", sub_id, "technique_id", meta.get("mitre_f3", []))
-    _insert_multi(conn, "submission_groupib_stages", sub_id, "stage", meta.get("groupib_stages", []))
+    _insert_multi(conn, "submission_sectors", sub_id, "sector", meta.get("sector", []), pending)
+    _insert_multi(conn, "submission_fraud_types", sub_id, "fraud_type", meta.get("fraud_types", []), pending)
+    _insert_multi(conn, "submission_tags", sub_id, "tag", meta.get("tags", []), pending)
+    _insert_multi(conn, "submission_cfpf_phases", sub_id, "phase", meta.get("cfpf_phases", []), pending)
+    _insert_multi(conn, "submission_mitre_attack", sub_id, "technique_id", meta.get("mitre_attack", []), pending)
+    _insert_multi(conn, "submission_ft3_tactics", sub_id, "tactic_id", meta.get("ft3_tactics", []), pending)
+    _insert_multi(conn, "submission_mitre_f3", sub_id, "technique_id", meta.get("mitre_f3", []), pending)
+    _insert_multi(conn, "submission_groupib_stages", sub_id, "stage", meta.get("groupib_stages", []), pending)
 
     # UCFF domains — stored as JSON object (not multi-value array)
     ucff = meta.get("ucff_domains")
     if ucff and isinstance(ucff, dict):
-        conn.execute(
-            "INSERT OR REPLACE INTO submission_ucff_domains (submission_id, domains_json) VALUES (?, ?)",
-            (sub_id, json.dumps(ucff))
-        )
+        _queue_rows(conn, pending, "submission_ucff_domains", ("submission_id", "domains_json"),
+                    [(sub_id, json.dumps(ucff))])
 
 
 # Whitelist of valid (table, column) pairs for multi-value operations.
@@ -347,19 +495,94 @@ _VALID_MULTI_TABLES = {
     ("submission_groupib_stages", "stage"),
 }
 
+# Prebuilt whole-table reads for _preload, keyed like _VALID_MULTI_TABLES
+_PRELOAD_SQL = {
+    (table, col): f"SELECT submission_id, {col} FROM {table} ORDER BY rowid"
+    for table, col in _VALID_MULTI_TABLES
+}
+
+# Tables written with INSERT OR REPLACE (a later file with the same id wins)
+_UPSERT_TABLES = {"submissions", "submission_ucff_domains"}
+
+
+# SQLite's historical default for SQLITE_MAX_VARIABLE_NUMBER
+_MAX_SQL_VARIABLES = 999
+
+
+def _bulk_insert(conn: sqlite3.Connection, table: str, cols: tuple[str, ...], rows: list,
+                 replace: bool = False):
+    """Insert rows using multi-row VALUES statements.
+
+    Rows are sent in chunks that stay under SQLite's bound-parameter limit.
+    ``table`` and ``cols`` must come from trusted, whitelisted names.
+    """
+    if not rows:
+        return
+    chunk = _MAX_SQL_VARIABLES // len(cols)
+    for start in range(0, len(rows), chunk):
+        batch = rows[start:start + chunk]
+        conn.execute(
+            _insert_sql(table, cols, replace, len(batch)),
+            [value for row in batch for value in row]
+        )
 
-def _insert_multi(conn: sqlite3.Connection, table: str, sub_id: str, col: str, values):
-    """Insert multi-value list entries for a submission."""
+
+@lru_cache(maxsize=None)
+def _insert_sql(table: str, cols: tuple[str, ...], replace: bool, nrows: int) -> str:
+    """Build (once) the multi-row INSERT text for ``nrows`` rows.
+
+    Every full chunk reuses the identical string, so SQLite's statement
+    cache serves it without re-parsing.
+    """
+    placeholder = "(" + ", ".join("?" * len(cols)) + ")"
+    verb = "INSERT OR REPLACE" if replace else "INSERT"
+    return f"{verb} INTO {table} ({', '.join(cols)}) VALUES " + ", ".join([placeholder] * nrows)
+
+
+def _queue_rows(conn: sqlite3.Connection, pending: dict | None, table: str,
+                cols: tuple[str, ...], rows: list):
+    """Queue rows under (table, cols) in ``pending``, or insert them now if it is None."""
+    if pending is not None:
+        pending.setdefault((table, cols), []).extend(rows)
+    else:
+        _bulk_insert(conn, table, cols, rows, replace=table in _UPSERT_TABLES)
+
+
+def _multi_rows(table: str, sub_id: str, col: str, values) -> list[tuple[str, str]]:
+    """Build (submission_id, value) rows for a multi-value table.
+
+    Empty values and repeats within the submission are dropped; values are
+    interned since the same tags, sectors and phases recur across files.
+    """
     if (table, col) not in _VALID_MULTI_TABLES:
         raise ValueError(f"Invalid table/column pair: {table}.{col}")
     if not values or not isinstance(values, list):
-        return
+        return []
+    if isinstance(sub_id, str):  # frontmatter may give a non-string id
+        sub_id = sys.intern(sub_id)
+    seen = set()
+    rows = []
     for val in values:
-        if val:  # skip empty strings/None
-            conn.execute(
-                f"INSERT INTO {table} (submission_id, {col}) VALUES (?, ?)",
-                (sub_id, str(val))
-            )
+        if not val:  # skip empty strings/None
+            continue
+        val = sys.intern(str(val))
+        if val not in seen:
+            seen.add(val)
+            rows.append((sub_id, val))
+    return rows
+
+
+def _insert_multi(conn: sqlite3.Connection, table: str, sub_id: str, col: str, values,
+                  pending: dict | None = None):
+    """Insert multi-value list entries for a submission (queued if ``pending`` is given)."""
+    _queue_rows(conn, pending, table, ("submission_id", col), _multi_rows(table, sub_id, col, values))
+
+
+def _flush_pending(conn: sqlite3.Connection, pending: dict):
+    """Write all queued rows, one bulk insert per table, in first-queued order."""
+    for (table, cols), rows in pending.items():
+        _bulk_insert(conn, table, cols, rows, replace=table in _UPSERT_TABLES)
+    pending.clear()
 
 
 def load_techniques(conn: sqlite3.Connection, techniques_path: Path):
@@ -369,26 +592,21 @@ def load_techniques(conn: sqlite3.Connection, techniques_path: Path):
         return 0
 
     data = json.loads(techniques_path.read_text(encoding="utf-8"))
-    count = 0
-    phases = data.get("phases", {})
-    for phase_id, phase_data in phases.items():
-        for tech in phase_data.get("techniques", []):
-            conn.execute(
-                """INSERT OR REPLACE INTO techniques
-                   (id, phase, name, description, indicators, mitre_attack, fraud_types)
-                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    tech["id"],
-                    phase_id,
-                    tech["name"],
-                    tech.get("description", ""),
-                    json.dumps(tech.get("indicators", [])),
-                    json.dumps(tech.get("mitre_attack", [])),
-                    json.dumps(tech.get("fraud_types", [])),
-                )
-            )
-            count += 1
-    return count
+    rows = [
+        (
+            tech["id"],
+            phase_id,
+            tech["name"],
+            tech.get("description", ""),
+            json.dumps(tech.get("indicators", [])),
+            json.dumps(tech.get("mitre_attack", [])),
+            json.dumps(tech.get("fraud_types", [])),
+        )
+        for phase_id, phase_data in data.get("phases", {}).items()
+        for tech in phase_data.get("techniques", [])
+    ]
+    conn.executemany(INSERT_TECHNIQUE_SQL, rows)
+    return len(rows)
 
 
 # ---------------------------------------------------------------------------
@@ -405,10 +623,8 @@ def build_regulatory_alerts(conn: sqlite3.Connection, csv_path: Path) -> int:
         log.warning("Regulatory alerts CSV not found at %s", csv_path)
         return 0
 
-    # Clear previous mappings so re-runs are idempotent
-    conn.execute("DELETE FROM regulatory_alert_tp_mapping")
-
-    count = 0
+    alert_rows = []
+    mapping_rows = []
     with open(csv_path, newline="", encoding="utf-8") as fh:
         reader = csv.DictReader(fh)
         for row in reader:
@@ -416,210 +632,321 @@ def build_regulatory_alerts(conn: sqlite3.Connection, csv_path: Path) -> int:
             if not alert_id:
                 continue
 
-            conn.execute(
-                """INSERT OR REPLACE INTO regulatory_alerts
-                   (alert_id, source, title, date, category, severity, url, summary)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    alert_id,
-                    row.get("source", "").strip(),
-                    row.get("title", "").strip(),
-                    row.get("date", "").strip(),
-                    row.get("category", "").strip(),
-                    row.get("severity", "").strip(),
-                    row.get("url", "").strip(),
-                    row.get("summary", "").strip(),
-                ),
-            )
-
-            # Split mapped_tp_ids on | and insert each mapping
+            alert_rows.append((
+                alert_id,
+                row.get("source", "").strip(),
+                row.get("title", "").strip(),
+                row.get("date", "").strip(),
+                row.get("category", "").strip(),
+                row.get("severity", "").strip(),
+                row.get("url", "").strip(),
+                row.get("summary", "").strip(),
+            ))
+
+            # Split mapped_tp_ids on | and collect each mapping
             tp_ids_raw = row.get("mapped_tp_ids", "").strip()
             if tp_ids_raw:
                 for tp_id in tp_ids_raw.split("|"):
                     tp_id = tp_id.strip()
                     if tp_id:
-                        conn.execute(
-                            "INSERT INTO regulatory_alert_tp_mapping (alert_id, tp_id) VALUES (?, ?)",
-                            (alert_id, tp_id),
-                        )
+                        mapping_rows.append((alert_id, tp_id))
+
+    with transaction(conn):
+        # Clear previous mappings so re-runs are idempotent
+        conn.execute("DELETE FROM regulatory_alert_tp_mapping")
+        conn.executemany(
+            """INSERT OR REPLACE INTO regulatory_alerts
+               (alert_id, source, title, date, category, severity, url, summary)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+            alert_rows,
+        )
+        conn.executemany(
+            "INSERT INTO regulatory_alert_tp_mapping (alert_id, tp_id) VALUES (?, ?)",
+            mapping_rows,
+        )
 
-            count += 1
+    return len(alert_rows)
 
-    conn.commit()
+
+def _dumps_indented(obj) -> bytes:
+    """Serialize to 2-space indented UTF-8 JSON, using orjson when installed.
+
+    Both paths match ``json.dumps(obj, indent=2, ensure_ascii=False)`` byte
+    for byte on the exported data (orjson only differs in exponent notation
+    for very large floats, which FLAME data does not contain).
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _dumps_compact(obj) -> bytes:
+    """Serialize to compact UTF-8 JSON with a trailing newline.
+
+    Used for files only the frontend reads, where indentation is dead weight.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+    return (json.dumps(obj, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _write_json_array(output_path: Path, entries, compact: bool = False) -> int:
+    """Stream an iterable of dicts to ``output_path`` as a JSON array.
+
+    Output is byte-identical to ``json.dumps(list(entries), indent=2,
+    ensure_ascii=False)`` (or to _dumps_compact when ``compact``) but only
+    one entry is held in memory at a time. Returns the number of entries
+    written.
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    digest = hashlib.blake2b(digest_size=16)
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    try:
+        with open(tmp_path, "wb") as fh:
+            def emit(chunk: bytes):
+                digest.update(chunk)
+                fh.write(chunk)
+
+            for entry in entries:
+                if compact:
+                    emit(b"[" if count == 0 else b",")
+                    emit(_dumps_compact(entry)[:-1])
+                else:
+                    emit(b"[\n  " if count == 0 else b",\n  ")
+                    # JSON strings never contain raw newlines, so re-indenting is safe
+                    emit(_dumps_indented(entry).replace(b"\n", b"\n  "))
+                count += 1
+            if compact:
+                emit(b"]\n" if count else b"[]\n")
+            else:
+                emit(b"\n]" if count else b"[]")
+            size = fh.tell()
+        _replace_if_changed(tmp_path, output_path, size, digest.digest())
+    except BaseException:
+        # A failing entries generator must not leave a stray .tmp behind
+        tmp_path.unlink(missing_ok=True)
+        raise
     return count
 
 
+def _file_digest(path: Path) -> bytes:
+    """Return the 16-byte BLAKE2b digest of the file at ``path``."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def _replace_if_changed(tmp_path: Path, output_path: Path, size: int, digest: bytes):
+    """Move ``tmp_path`` over ``output_path`` unless the contents match.
+
+    Leaving an unchanged export in place keeps its mtime stable, so static
+    hosts and browser caches do not see a new file on every rebuild.
+    """
+    try:
+        unchanged = (os.path.getsize(output_path) == size
+                     and _file_digest(output_path) == digest)
+    except FileNotFoundError:
+        unchanged = False
+    if unchanged:
+        tmp_path.unlink()
+    else:
+        os.replace(tmp_path, output_path)
+
+
+def _row_cursor(conn: sqlite3.Connection, sql: str, params=()) -> sqlite3.Cursor:
+    """Execute ``sql`` on a cursor that yields sqlite3.Row objects.
+
+    The factory is set per cursor so other callers keep plain tuples.
+    """
+    cursor = conn.cursor()
+    cursor.row_factory = sqlite3.Row
+    return cursor.execute(sql, params)
+
+
 def export_regulatory_json(conn: sqlite3.Connection, output_path: Path) -> int:
     """Export regulatory alerts as a JSON file.
 
     Returns the number of alerts exported.
     """
-    cursor = conn.execute(
+    cursor = _row_cursor(
+        conn,
         "SELECT alert_id, source, title, date, category, severity, url, summary "
         "FROM regulatory_alerts ORDER BY date DESC"
     )
-    columns = [desc[0] for desc in cursor.description]
-    alerts = []
-
-    for row in cursor.fetchall():
-        entry = dict(zip(columns, row))
-        # Fetch TP mappings for this alert
-        tp_rows = conn.execute(
-            "SELECT tp_id FROM regulatory_alert_tp_mapping WHERE alert_id = ? ORDER BY tp_id",
-            (entry["alert_id"],),
-        ).fetchall()
-        entry["mapped_tp_ids"] = [r[0] for r in tp_rows]
-        alerts.append(entry)
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(
-        json.dumps(alerts, indent=2, ensure_ascii=False),
-        encoding="utf-8",
-    )
-    return len(alerts)
+    # All TP mappings in one ordered scan instead of a query per alert
+    mapped: dict[str, list] = {}
+    for alert_id, tp_id in conn.execute(
+        "SELECT alert_id, tp_id FROM regulatory_alert_tp_mapping ORDER BY alert_id, tp_id"
+    ):
+        mapped.setdefault(alert_id, []).append(tp_id)
+
+    def alerts():
+        for row in cursor:
+            entry = dict(row)
+            entry["mapped_tp_ids"] = mapped.get(entry["alert_id"], [])
+            yield entry
+
+    return _write_json_array(output_path, alerts())
 
 
 # ---------------------------------------------------------------------------
 # JSON export
 # ---------------------------------------------------------------------------
 
-def export_json(conn: sqlite3.Connection, output_path: Path):
-    """Export the database to a flat JSON array for the frontend."""
-    cursor = conn.execute("SELECT * FROM submissions WHERE lower(category) = 'threatpath' ORDER BY id")
-    columns = [desc[0] for desc in cursor.description]
-    submissions = []
+# Entry key -> (table, column) for each multi-value list, in export order
+_MULTI_FIELDS = {
+    "sectors": ("submission_sectors", "sector"),
+    "fraud_types": ("submission_fraud_types", "fraud_type"),
+    "tags": ("submission_tags", "tag"),
+    "cfpf_phases": ("submission_cfpf_phases", "phase"),
+    "mitre_attack": ("submission_mitre_attack", "technique_id"),
+    "ft3_tactics": ("submission_ft3_tactics", "tactic_id"),
+    "mitre_f3": ("submission_mitre_f3", "technique_id"),
+    "groupib_stages": ("submission_groupib_stages", "stage"),
+}
 
-    for row in cursor.fetchall():
-        entry = dict(zip(columns, row))
-        sub_id = entry["id"]
 
-        # Attach multi-value lists
-        entry["sectors"] = _fetch_list(conn, "submission_sectors", "sector", sub_id)
-        entry["fraud_types"] = _fetch_list(conn, "submission_fraud_types", "fraud_type", sub_id)
-        entry["tags"] = _fetch_list(conn, "submission_tags", "tag", sub_id)
-        entry["cfpf_phases"] = _fetch_list(conn, "submission_cfpf_phases", "phase", sub_id)
-        entry["mitre_attack"] = _fetch_list(conn, "submission_mitre_attack", "technique_id", sub_id)
-        entry["ft3_tactics"] = _fetch_list(conn, "submission_ft3_tactics", "tactic_id", sub_id)
-        entry["mitre_f3"] = _fetch_list(conn, "submission_mitre_f3", "technique_id", sub_id)
-        entry["groupib_stages"] = _fetch_list(conn, "submission_groupib_stages", "stage", sub_id)
-
-        # UCFF domains (object, not array)
-        ucff_row = conn.execute(
-            "SELECT domains_json FROM submission_ucff_domains WHERE submission_id = ?",
-            (sub_id,)
-        ).fetchone()
-        entry["ucff_domains"] = json.loads(ucff_row[0]) if ucff_row else {}
-
-        # Remove full body from JSON export (too large for frontend)
-        entry.pop("body", None)
+def _preload(conn: sqlite3.Connection, table: str, col: str) -> dict[str, list]:
+    """Load a whole multi-value table as ``{submission_id: [values...]}``.
 
-        submissions.append(entry)
+    Values keep their insertion (rowid) order within each submission.
+    """
+    sql = _PRELOAD_SQL.get((table, col))
+    if sql is None:
+        raise ValueError(f"Invalid table/column pair: {table}.{col}")
+    grouped: dict[str, list] = {}
+    for sub_id, value in conn.execute(sql):
+        grouped.setdefault(sub_id, []).append(value)
+    return grouped
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(
-        json.dumps(submissions, indent=2, ensure_ascii=False),
-        encoding="utf-8"
-    )
-    return len(submissions)
 
+def fetch_child_lists(conn: sqlite3.Connection) -> dict[str, dict]:
+    """Preload every multi-value table in one query each.
 
-def _fetch_list(conn: sqlite3.Connection, table: str, col: str, sub_id: str) -> list:
-    """Fetch a list of values from a multi-value table."""
-    if (table, col) not in _VALID_MULTI_TABLES:
-        raise ValueError(f"Invalid table/column pair: {table}.{col}")
-    rows = conn.execute(
-        f"SELECT {col} FROM {table} WHERE submission_id = ? ORDER BY rowid",
-        (sub_id,)
-    ).fetchall()
-    return [r[0] for r in rows]
+    Returns ``{entry_key: {submission_id: [values...]}}`` plus an
+    ``ucff_domains`` map of parsed domain objects, so exporters can attach
+    child data without a query per submission.
+    """
+    child_lists = {
+        key: _preload(conn, table, col) for key, (table, col) in _MULTI_FIELDS.items()
+    }
+
+    ucff: dict[str, dict] = {}
+    for sub_id, domains_json in conn.execute(
+        "SELECT submission_id, domains_json FROM submission_ucff_domains ORDER BY rowid"
+    ):
+        if sub_id not in ucff:
+            ucff[sub_id] = json.loads(domains_json)
+    child_lists["ucff_domains"] = ucff
+    return child_lists
 
 
-def _build_full_entry(conn: sqlite3.Connection, entry: dict) -> dict:
+def _build_full_entry(entry: dict, child_lists: dict) -> dict:
     """Attach all multi-value lists to a submission entry dict."""
     sub_id = entry["id"]
-    entry["sectors"] = _fetch_list(conn, "submission_sectors", "sector", sub_id)
-    entry["fraud_types"] = _fetch_list(conn, "submission_fraud_types", "fraud_type", sub_id)
-    entry["tags"] = _fetch_list(conn, "submission_tags", "tag", sub_id)
-    entry["cfpf_phases"] = _fetch_list(conn, "submission_cfpf_phases", "phase", sub_id)
-    entry["mitre_attack"] = _fetch_list(conn, "submission_mitre_attack", "technique_id", sub_id)
-    entry["ft3_tactics"] = _fetch_list(conn, "submission_ft3_tactics", "tactic_id", sub_id)
-    entry["mitre_f3"] = _fetch_list(conn, "submission_mitre_f3", "technique_id", sub_id)
-    entry["groupib_stages"] = _fetch_list(conn, "submission_groupib_stages", "stage", sub_id)
+    for key in _MULTI_FIELDS:
+        entry[key] = list(child_lists[key].get(sub_id, ()))
 
     # UCFF domains (object, not array)
-    ucff_row = conn.execute(
-        "SELECT domains_json FROM submission_ucff_domains WHERE submission_id = ?",
-        (sub_id,)
-    ).fetchone()
-    entry["ucff_domains"] = json.loads(ucff_row[0]) if ucff_row else {}
+    entry["ucff_domains"] = child_lists["ucff_domains"].get(sub_id, {})
 
     return entry
 
 
-def export_index_json(conn: sqlite3.Connection, output_path: Path,
-                      evidence_map: dict | None = None):
-    """Export metadata-only index for fast frontend initial load."""
-    cursor = conn.execute("SELECT * FROM submissions WHERE lower(category) = 'threatpath' ORDER BY id")
-    columns = [desc[0] for desc in cursor.description]
-    index_entries = []
+def materialize_submissions(conn: sqlite3.Connection,
+                            evidence_map: dict | None = None) -> list[dict]:
+    """Load every threat path with its child lists and evidence in one pass.
 
+    Exporters project fields from these dicts instead of re-querying.
+    """
     if evidence_map is None:
         evidence_map = {}
+    child_lists = fetch_child_lists(conn)
 
-    for row in cursor.fetchall():
-        entry = dict(zip(columns, row))
-        entry = _build_full_entry(conn, entry)
+    cursor = _row_cursor(conn, "SELECT * FROM submissions WHERE lower(category) = 'threatpath' ORDER BY id")
+    submissions = []
+    for row in cursor:
+        entry = _build_full_entry(dict(row), child_lists)
+        entry["evidence"] = evidence_map.get(entry["id"], [])
+        submissions.append(entry)
+    return submissions
 
-        # Truncate summary for index (first 200 chars)
-        full_summary = entry.get("summary", "")
-        entry["summary"] = full_summary[:200] + ("..." if len(full_summary) > 200 else "")
 
-        # Add evidence count
-        sub_id = entry["id"]
-        entry["evidence_count"] = len(evidence_map.get(sub_id, []))
+def export_json(submissions: list[dict], output_path: Path):
+    """Export the database to a flat JSON array for the frontend."""
+    # Omit full body (too large for frontend) and the evidence detail
+    return _write_json_array(output_path, (
+        {k: v for k, v in entry.items() if k not in ("body", "evidence")}
+        for entry in submissions
+    ))
 
-        # Remove body — not needed for browse view
-        entry.pop("body", None)
-        # Remove file_path — internal only
-        entry.pop("file_path", None)
 
-        index_entries.append(entry)
+def export_index_json(submissions: list[dict], output_path: Path):
+    """Export metadata-only index for fast frontend initial load."""
+    def index_entries():
+        for full in submissions:
+            # Drop body (not needed for browse view) and file_path (internal only)
+            entry = {k: v for k, v in full.items()
+                     if k not in ("body", "file_path", "evidence")}
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(
-        json.dumps(index_entries, indent=2, ensure_ascii=False),
-        encoding="utf-8"
-    )
-    return len(index_entries)
+            # Truncate summary for index (first 200 chars)
+            full_summary = entry.get("summary", "")
+            entry["summary"] = full_summary[:200] + ("..." if len(full_summary) > 200 else "")
+
+            # Add evidence count
+            entry["evidence_count"] = len(full["evidence"])
+
+            yield entry
 
+    return _write_json_array(output_path, index_entries(), compact=True)
 
-def export_content_files(conn: sqlite3.Connection, output_dir: Path,
-                         evidence_map: dict | None = None):
+
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+
+def _write_file(path: Path, data: bytes):
+    """Write ``data`` with a raw open/write/close and no buffered text layer."""
+    fd = os.open(path, _WRITE_FLAGS, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _write_if_changed(path: Path, data: bytes) -> bool:
+    """Write ``data`` to ``path`` unless the file already holds those bytes.
+
+    Returns True when the file was (re)written.
+    """
+    try:
+        if os.path.getsize(path) == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    _write_file(path, data)
+    return True
+
+
+def export_content_files(submissions: list[dict], output_dir: Path):
     """Export individual TP-XXXX.json files for lazy loading."""
-    cursor = conn.execute("SELECT * FROM submissions WHERE lower(category) = 'threatpath' ORDER BY id")
-    columns = [desc[0] for desc in cursor.description]
     count = 0
 
-    if evidence_map is None:
-        evidence_map = {}
-
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    for row in cursor.fetchall():
-        entry = dict(zip(columns, row))
-        entry = _build_full_entry(conn, entry)
-
+    for full in submissions:
         # Remove file_path — internal only
-        entry.pop("file_path", None)
-
-        sub_id = entry["id"]
-        entry["evidence"] = evidence_map.get(sub_id, [])
+        entry = {k: v for k, v in full.items() if k != "file_path"}
         entry["evidence_count"] = len(entry["evidence"])
 
-        filepath = output_dir / f"{sub_id}.json"
-        filepath.write_text(
-            json.dumps(entry, indent=2, ensure_ascii=False),
-            encoding="utf-8"
+        _write_if_changed(
+            output_dir / f"{entry['id']}.json",
+            _dumps_compact(entry)
         )
         count += 1
 
@@ -630,10 +957,11 @@ def export_stats_json(conn: sqlite3.Connection, output_path: Path):
     """Export pre-computed aggregate statistics."""
     total = conn.execute("SELECT COUNT(*) FROM submissions WHERE lower(category) = 'threatpath'").fetchone()[0]
 
-    fraud_types = conn.execute(
-        "SELECT DISTINCT fraud_type FROM submission_fraud_types sft JOIN submissions s ON sft.submission_id = s.id WHERE lower(s.category) = 'threatpath' ORDER BY fraud_type"
-    ).fetchall()
-    fraud_type_list = [r[0] for r in fraud_types]
+    # One grouped scan gives both the fraud type list and per-type TP totals
+    ft_totals = dict(conn.execute(
+        "SELECT sft.fraud_type, COUNT(*) FROM submission_fraud_types sft JOIN submissions s ON sft.submission_id = s.id WHERE lower(s.category) = 'threatpath' GROUP BY sft.fraud_type ORDER BY sft.fraud_type"
+    ).fetchall())
+    fraud_type_list = list(ft_totals)
 
     sectors = conn.execute(
         "SELECT DISTINCT sector FROM submission_sectors ss JOIN submissions s ON ss.submission_id = s.id WHERE lower(s.category) = 'threatpath' ORDER BY sector"
@@ -641,9 +969,9 @@ def export_stats_json(conn: sqlite3.Connection, output_path: Path):
     sector_list = [r[0] for r in sectors]
 
     tags = conn.execute(
-        "SELECT tag, COUNT(*) as cnt FROM submission_tags st JOIN submissions s ON st.submission_id = s.id WHERE lower(s.category) = 'threatpath' GROUP BY tag ORDER BY cnt DESC"
+        "SELECT tag, COUNT(*) as cnt FROM submission_tags st JOIN submissions s ON st.submission_id = s.id WHERE lower(s.category) = 'threatpath' GROUP BY tag ORDER BY cnt DESC, tag LIMIT 20"
     ).fetchall()
-    top_tags = [{"tag": r[0], "count": r[1]} for r in tags[:20]]
+    top_tags = [{"tag": r[0], "count": r[1]} for r in tags]
 
     # CFPF phase coverage: count of TPs per phase
     phases = conn.execute(
@@ -652,27 +980,19 @@ def export_stats_json(conn: sqlite3.Connection, output_path: Path):
     phase_coverage = {r[0]: r[1] for r in phases}
 
     # Coverage matrix: fraud_type × phase
-    coverage_matrix = []
-    for ft in fraud_type_list:
-        # Find all TPs with this fraud type
-        tp_rows = conn.execute(
-            "SELECT sft.submission_id FROM submission_fraud_types sft JOIN submissions s ON sft.submission_id = s.id WHERE sft.fraud_type = ? AND lower(s.category) = 'threatpath'",
-            (ft,)
-        ).fetchall()
-        tp_ids = [r[0] for r in tp_rows]
-        phases_for_ft = {}
-        for tp_id in tp_ids:
-            tp_phases = conn.execute(
-                "SELECT phase FROM submission_cfpf_phases WHERE submission_id = ?",
-                (tp_id,)
-            ).fetchall()
-            for p in tp_phases:
-                phases_for_ft[p[0]] = phases_for_ft.get(p[0], 0) + 1
-        coverage_matrix.append({
+    ft_phases: dict[str, dict] = {}
+    for ft, phase, cnt in conn.execute(
+        "SELECT sft.fraud_type, sp.phase, COUNT(*) FROM submission_fraud_types sft JOIN submissions s ON sft.submission_id = s.id JOIN submission_cfpf_phases sp ON sp.submission_id = s.id WHERE lower(s.category) = 'threatpath' GROUP BY sft.fraud_type, sp.phase ORDER BY sft.fraud_type, sp.phase"
+    ):
+        ft_phases.setdefault(ft, {})[phase] = cnt
+    coverage_matrix = [
+        {
             "fraud_type": ft,
-            "phases": phases_for_ft,
-            "total_tps": len(tp_ids)
-        })
+            "phases": ft_phases.get(ft, {}),
+            "total_tps": ft_totals[ft]
+        }
+        for ft in fraud_type_list
+    ]
 
     # Regulatory alert stats
     reg_total = conn.execute("SELECT COUNT(*) FROM regulatory_alerts").fetchone()[0]
@@ -685,6 +1005,7 @@ def export_stats_json(conn: sqlite3.Connection, output_path: Path):
     ).fetchall()
     reg_by_source = {r[0]: r[1] for r in reg_by_source_rows if r[0]}
 
+    now = datetime.now(timezone.utc)
     stats = {
         "total": total,
         "fraudTypes": len(fraud_type_list),
@@ -698,16 +1019,13 @@ def export_stats_json(conn: sqlite3.Connection, output_path: Path):
             "total": reg_total,
             "bySeverity": reg_by_severity,
             "bySource": reg_by_source,
-            "lastUpdated": datetime.now(timezone.utc).strftime("%Y-%m-%d"),
+            "lastUpdated": now.strftime("%Y-%m-%d"),
         },
-        "generatedAt": datetime.now(timezone.utc).isoformat(),
+        "generatedAt": now.isoformat(),
     }
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(
-        json.dumps(stats, indent=2, ensure_ascii=False),
-        encoding="utf-8"
-    )
+    output_path.write_bytes(_dumps_compact(stats))
     return stats
 
 
@@ -717,30 +1035,29 @@ def export_evidence_index(evidence_map: dict, output_path: Path):
     Generates flame-evidence-index.json listing all evidence entries
     across all threat paths with key metadata for fast lookup.
     """
-    flat_entries = []
-    for tp_id, entries in sorted(evidence_map.items()):
-        for ev in entries:
-            flat_entries.append({
-                "evidence_id": ev.get("evidence_id", ""),
-                "tp_id": tp_id,
-                "title": ev.get("title", ""),
-                "source": ev.get("source", ""),
-                "cluster": ev.get("cluster", ""),
-                "domain_count": ev.get("domain_count", ""),
-                "confidence": ev.get("confidence", ""),
-                "cfpf_phase_coverage": ev.get("cfpf_phase_coverage", ""),
-            })
-
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(
-        json.dumps(flat_entries, indent=2, ensure_ascii=False),
-        encoding="utf-8"
-    )
-    return len(flat_entries)
-
-
-def export_index_md(conn: sqlite3.Connection, output_path: Path, stats: dict):
-    """Programmatically generate INDEX.md based on parsed database."""
+    def flat_entries():
+        for tp_id, entries in sorted(evidence_map.items()):
+            for ev in entries:
+                yield {
+                    "evidence_id": ev.get("evidence_id", ""),
+                    "tp_id": tp_id,
+                    "title": ev.get("title", ""),
+                    "source": ev.get("source", ""),
+                    "cluster": ev.get("cluster", ""),
+                    "domain_count": ev.get("domain_count", ""),
+                    "confidence": ev.get("confidence", ""),
+                    "cfpf_phase_coverage": ev.get("cfpf_phase_coverage", ""),
+                }
+
+    return _write_json_array(output_path, flat_entries())
+
+
+def export_index_md(conn: sqlite3.Connection, output_path: Path, stats: dict,
+                    submissions: list[dict]):
+    """Programmatically generate INDEX.md based on parsed database.
+
+    ``submissions`` is the list from materialize_submissions.
+    """
     lines = [
         "# FLAME Threat Path Index",
         "",
@@ -752,13 +1069,12 @@ def export_index_md(conn: sqlite3.Connection, output_path: Path, stats: dict):
         "| ID | Title | Fraud Types | Sectors | CFPF Phases |",
         "|----|-------|-------------|---------|-------------|"
     ]
-    cursor = conn.execute("SELECT id, title FROM submissions WHERE lower(category) = 'threatpath' ORDER BY id")
-    for row in cursor.fetchall():
-        sub_id = row[0]
-        title = row[1]
-        fraud_types = ", ".join(_fetch_list(conn, "submission_fraud_types", "fraud_type", sub_id))
-        sectors = ", ".join(map(str.capitalize, _fetch_list(conn, "submission_sectors", "sector", sub_id)))
-        phases = _fetch_list(conn, "submission_cfpf_phases", "phase", sub_id)
+    for entry in submissions:
+        sub_id = entry["id"]
+        title = entry["title"]
+        fraud_types = ", ".join(entry["fraud_types"])
+        sectors = ", ".join(map(str.capitalize, entry["sectors"]))
+        phases = entry["cfpf_phases"]
         
         def format_phases(p_list):
             if not p_list: return ""
@@ -839,18 +1155,103 @@ def export_index_md(conn: sqlite3.Connection, output_path: Path, stats: dict):
 # Main
 # ---------------------------------------------------------------------------
 
+# Below this many files, worker start-up costs more than it saves
+PARALLEL_PARSE_MIN_FILES = 64
+
+
+# Bump when parse_markdown's output changes so stale cache entries are dropped
+BUILD_CACHE_VERSION = 1
+
+
+def load_build_cache(cache_path: Path) -> dict:
+    """Load the parse cache ({path: entry}); missing or stale caches load empty."""
+    try:
+        data = json.loads(cache_path.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != BUILD_CACHE_VERSION:
+        return {}
+    return data.get("files", {})
+
+
+def save_build_cache(cache_path: Path, files: dict):
+    """Write the parse cache. Non-JSON YAML scalars (dates) are stored via str()."""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(
+        json.dumps({"version": BUILD_CACHE_VERSION, "files": files},
+                   ensure_ascii=False, default=str),
+        encoding="utf-8"
+    )
+
+
+def parse_all(md_files: list[Path], cache: dict | None = None) -> list[tuple]:
+    """Run parse_markdown over every file, fanning out to processes for large trees.
+
+    Results keep the order of ``md_files``; database writes stay in the caller.
+    When ``cache`` is given, files whose mtime and size match their entry are
+    not re-read, and the cache is updated in place to cover exactly
+    ``md_files``.
+    """
+    if cache is None:
+        return _parse_many(md_files)
+
+    results: list = [None] * len(md_files)
+    fresh = {}
+    misses = []
+    for i, filepath in enumerate(md_files):
+        st = filepath.stat()
+        key = str(filepath)
+        entry = cache.get(key)
+        if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            results[i] = (entry["meta"], entry["body"], entry["summary"], entry["evidence"])
+            fresh[key] = entry
+        else:
+            misses.append((i, key, st))
+
+    parsed = _parse_many([md_files[i] for i, _, _ in misses])
+    for (i, key, st), result in zip(misses, parsed):
+        results[i] = result
+        meta, body, summary, evidence = result
+        if meta is not None:  # failures are re-parsed so they are reported again
+            fresh[key] = {
+                "mtime_ns": st.st_mtime_ns, "size": st.st_size,
+                "meta": meta, "body": body, "summary": summary, "evidence": evidence,
+            }
+
+    cache.clear()
+    cache.update(fresh)
+    return results
+
+
+def _parse_many(md_files: list[Path]) -> list[tuple]:
+    """parse_markdown over ``md_files``, in a process pool when worthwhile."""
+    workers = os.cpu_count() or 1
+    if workers < 2 or len(md_files) < PARALLEL_PARSE_MIN_FILES:
+        return [parse_markdown(fp) for fp in md_files]
+    # About four chunks per worker: few enough IPC round trips, yet every
+    # worker gets a share and stragglers even out
+    chunksize = max(1, min(32, len(md_files) // (workers * 4)))
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(parse_markdown, md_files, chunksize=chunksize))
+
+
 def find_markdown_files(root: Path) -> list[Path]:
     """Find all markdown files in submission directories."""
     dirs = ["ThreatPaths", "Baselines", "DetectionLogic"]
     files = []
     for d in dirs:
-        dir_path = root / d
-        if dir_path.exists():
-            for f in sorted(dir_path.glob("*.md")):
-                # Skip index files
-                if f.name.upper() == "INDEX.MD":
-                    continue
-                files.append(f)
+        try:
+            entries = os.scandir(root / d)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        with entries:
+            # Same selection as glob("*.md"): no dotfiles; skip index files
+            names = sorted(
+                e.name for e in entries
+                if e.name.endswith(".md") and not e.name.startswith(".")
+                and e.name.upper() != "INDEX.MD" and e.is_file()
+            )
+        files.extend(root / d / name for name in names)
     return files
 
 
@@ -862,11 +1263,19 @@ def main():
         default=Path(__file__).resolve().parent.parent,
         help="Root directory of the FLAME repository"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-parse every markdown file instead of reusing .cache/build_database.json"
+    )
     args = parser.parse_args()
     root = args.root.resolve()
 
     log.info("FLAME Database Builder")
     log.info("Root: %s", root)
+    if SafeLoader is yaml.SafeLoader:
+        log.warning("libyaml not available; YAML parsing will be slow "
+                    "(reinstall pyyaml against libyaml for CSafeLoader)")
 
     # Find submission files
     md_files = find_markdown_files(root)
@@ -881,39 +1290,45 @@ def main():
     conn = init_database(db_path)
     log.info("Database initialized: %s", db_path)
 
-    # Load techniques catalog
-    techniques_path = root / "cfpf_techniques.json"
-    tech_count = load_techniques(conn, techniques_path)
-    log.info("Loaded %d CFPF techniques", tech_count)
-
-    # Process each submission file — collect evidence per TP
-    loaded = 0
-    errors = 0
-    evidence_map: dict[str, list] = {}  # tp_id -> list of evidence dicts
-    for filepath in md_files:
-        meta = extract_frontmatter(filepath)
-        if meta is None:
-            errors += 1
-            continue
+    # Ingest everything in one explicit transaction
+    with transaction(conn):
+        # Load techniques catalog
+        techniques_path = root / "cfpf_techniques.json"
+        tech_count = load_techniques(conn, techniques_path)
+        log.info("Loaded %d CFPF techniques", tech_count)
+
+        # Process each submission file — collect evidence per TP
+        loaded = 0
+        errors = 0
+        evidence_map: dict[str, list] = {}  # tp_id -> list of evidence dicts
+        total_evidence = 0
+        pending: dict = {}  # (table, cols) -> rows, flushed after the scan
+        cache_path = root / ".cache" / "build_database.json"
+        cache = None if args.no_cache else load_build_cache(cache_path)
+        parsed = parse_all(md_files, cache)
+        for filepath, (meta, body, summary, ev_entries) in zip(md_files, parsed):
+            if meta is None:
+                errors += 1
+                continue
 
-        body = extract_body(filepath)
-        summary = extract_summary(body)
-        load_submission(conn, meta, body, summary, filepath)
-
-        # Extract operational evidence from body
-        sub_id = meta.get("id", "")
-        ev_entries = extract_evidence(body)
-        if ev_entries:
-            evidence_map[sub_id] = ev_entries
-            log.info("  Loaded: %s (%s) — %d evidence entries",
-                     sub_id, meta.get("title", "?"), len(ev_entries))
-        else:
-            log.info("  Loaded: %s (%s)", sub_id, meta.get("title", "?"))
-        loaded += 1
+            load_submission(conn, meta, body, summary, filepath, pending)
 
-    conn.commit()
+            sub_id = meta.get("id", "")
+            if ev_entries:
+                # A later file with the same id replaces the earlier entries
+                total_evidence += len(ev_entries) - len(evidence_map.get(sub_id, ()))
+                evidence_map[sub_id] = ev_entries
+                log.info("  Loaded: %s (%s) — %d evidence entries",
+                         sub_id, meta.get("title", "?"), len(ev_entries))
+            else:
+                log.info("  Loaded: %s (%s)", sub_id, meta.get("title", "?"))
+            loaded += 1
+
+        _flush_pending(conn, pending)
+
+    if cache is not None:
+        save_build_cache(cache_path, cache)
 
-    total_evidence = sum(len(v) for v in evidence_map.values())
     log.info("Extracted %d evidence entries across %d TPs",
              total_evidence, len(evidence_map))
 
@@ -922,18 +1337,23 @@ def main():
     reg_count = build_regulatory_alerts(conn, reg_csv)
     log.info("Loaded %d regulatory alerts", reg_count)
 
+    create_indexes(conn)
+
+    # Load submissions once for all exporters
+    submissions = materialize_submissions(conn, evidence_map)
+
     # Export JSON (legacy — backward compatibility)
     json_path = root / "database" / "flame-data.json"
-    count = export_json(conn, json_path)
+    count = export_json(submissions, json_path)
     log.info("Exported %d submissions to %s (legacy)", count, json_path)
 
     # Export v2 data files
     index_path = root / "database" / "flame-index.json"
-    idx_count = export_index_json(conn, index_path, evidence_map)
+    idx_count = export_index_json(submissions, index_path)
     log.info("Exported %d submissions to %s (index)", idx_count, index_path)
 
     content_dir = root / "database" / "flame-content"
-    ct_count = export_content_files(conn, content_dir, evidence_map)
+    ct_count = export_content_files(submissions, content_dir)
     log.info("Exported %d content files to %s", ct_count, content_dir)
 
     # Export evidence index
@@ -952,7 +1372,7 @@ def main():
     
     # Export auto-generated markdown index
     md_index_path = root / "ThreatPaths" / "INDEX.md"
-    export_index_md(conn, md_index_path, stats)
+    export_index_md(conn, md_index_path, stats, submissions)
     log.info("Exported markdown index to %s", md_index_path)
 
     conn.close()
@@ -24,6 +24,7 @@ import argparse
 import csv
 import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List
 
@@ -60,6 +61,9 @@ SOURCE_REGISTRY: Dict[str, type] = {
     "fbi_ic3": FBIC3Source,
 }
 
+# Write buffer for the output CSV
+CSV_WRITE_BUFFER_SIZE = 1 << 20
+
 # ---------------------------------------------------------------------------
 # Core functions
 # ---------------------------------------------------------------------------
@@ -68,6 +72,10 @@ SOURCE_REGISTRY: Dict[str, type] = {
 def collect_alerts(sources: dict) -> List[RegulatoryAlert]:
     """Run all source instances and merge results into a single list.
 
+    Sources are independent and their ``run()`` calls are dominated by
+    network I/O, so they run concurrently on a thread pool.  Results are
+    merged in the order of ``sources`` regardless of completion order.
+
     Parameters
     ----------
     sources : dict
@@ -80,16 +88,23 @@ def collect_alerts(sources: dict) -> List[RegulatoryAlert]:
         lists (handled internally by ``RegulatorySource.run()``).
     """
     all_alerts: List[RegulatoryAlert] = []
-    for name, source in sources.items():
-        logger.info("Collecting alerts from %s ...", name)
-        alerts = source.run()
-        logger.info("  -> %d alert(s) from %s", len(alerts), name)
-        all_alerts.extend(alerts)
+    if not sources:
+        return all_alerts
+
+    with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+        futures = {}
+        for name, source in sources.items():
+            logger.info("Collecting alerts from %s ...", name)
+            futures[name] = executor.submit(source.run)
+        for name, future in futures.items():
+            alerts = future.result()
+            logger.info("  -> %d alert(s) from %s", len(alerts), name)
+            all_alerts.extend(alerts)
     return all_alerts
 
 
 def write_csv(alerts: List[RegulatoryAlert], output_path: Path) -> None:
-    """Write alerts to CSV using ``csv.DictWriter`` with ``CSV_COLUMNS``.
+    """Write alerts to CSV with a ``CSV_COLUMNS`` header row.
 
     Creates parent directories if they do not exist.  The ``mapped_tp_ids``
     field is serialized as a ``|``-delimited string and the ``date`` field
@@ -105,12 +120,13 @@ def write_csv(alerts: List[RegulatoryAlert], output_path: Path) -> None:
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_path, "w", newline="", encoding="utf-8") as fh:
-        writer = csv.DictWriter(fh, fieldnames=CSV_COLUMNS)
-        writer.writeheader()
-        for alert in alerts:
-            row = dict(zip(CSV_COLUMNS, alert.to_csv_row()))
-            writer.writerow(row)
+    # Rows are already in CSV_COLUMNS order and are streamed one at a time
+    # to csv.writer, without a per-row dict or a materialized row list
+    with open(output_path, "w", newline="", encoding="utf-8",
+              buffering=CSV_WRITE_BUFFER_SIZE) as fh:
+        writer = csv.writer(fh)
+        writer.writerow(CSV_COLUMNS)
+        writer.writerows(RegulatoryAlert.iter_csv_rows(alerts))
 
 
 # ---------------------------------------------------------------------------
@@ -181,17 +197,26 @@ def main(argv: List[str] | None = None) -> None:
     else:
         requested = list(SOURCE_REGISTRY.keys())
 
-    # ---- Instantiate sources -----------------------------------------------
-    active_sources: Dict[str, object] = {}
-    for name in requested:
+    # ---- Filter, then instantiate only the sources that will run ----------
+    enabled = {
+        name for name, cfg in source_configs.items()
+        if isinstance(cfg, dict) and cfg.get("enabled", False)
+    }
+    to_run: List[str] = []
+    disabled: List[str] = []
+    for name in dict.fromkeys(requested):
         if name not in SOURCE_REGISTRY:
             logger.warning("Unknown source '%s' -- skipping.", name)
-            continue
-        src_config = source_configs.get(name, {})
-        if not src_config.get("enabled", False):
-            logger.info("Source '%s' is disabled in config -- skipping.", name)
-            continue
-        active_sources[name] = SOURCE_REGISTRY[name](src_config)
+        elif name in enabled:
+            to_run.append(name)
+        else:
+            disabled.append(name)
+    if disabled:
+        logger.info("Disabled in config -- skipping: %s", ", ".join(disabled))
+
+    active_sources: Dict[str, object] = {
+        name: SOURCE_REGISTRY[name](source_configs[name]) for name in to_run
+    }
 
     if not active_sources:
         logger.warning("No active sources to run. Exiting.")
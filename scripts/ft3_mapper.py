@@ -19,11 +19,37 @@ Output:
 """
 
 import argparse
+import copy
 import json
 import logging
+import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import NamedTuple
+
+try:
+    import yaml
+except ImportError:
+    print("ERROR: pyyaml is required. Install with: pip install pyyaml",
+          file=sys.stderr)
+    sys.exit(1)
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logging.basicConfig(
     level=logging.INFO,
@@ -236,19 +262,40 @@ FRAUD_TYPE_KEYWORDS: dict[str, list[str]] = {
 }
 
 
+# Freeze each term list as a lowercased, de-duplicated tuple (order kept)
+# so the mapper never lowercases or re-checks terms per technique
+FRAUD_TYPE_KEYWORDS = {
+    fraud_type: tuple(dict.fromkeys(term.lower() for term in terms))
+    for fraud_type, terms in FRAUD_TYPE_KEYWORDS.items()
+}
+
+# Every keyword above; technique text is scanned for these once
+KEYWORD_VOCAB: frozenset[str] = frozenset(
+    term for terms in FRAUD_TYPE_KEYWORDS.values() for term in terms
+)
+
+
 # ---------------------------------------------------------------------------
 # FT3 data loading
 # ---------------------------------------------------------------------------
 
+def _load_json(path: Path):
+    """Parse a JSON file, using orjson when installed."""
+    data = path.read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 def load_ft3_tactics(path: Path) -> dict[str, dict]:
     """Load FT3 tactics JSON, keyed by tactic ID (e.g. FTA001)."""
-    data = json.loads(path.read_text(encoding="utf-8"))
+    data = _load_json(path)
     return {t["ID"]: t for t in data}
 
 
 def load_ft3_techniques(path: Path) -> list[dict]:
     """Load FT3 techniques JSON."""
-    return json.loads(path.read_text(encoding="utf-8"))
+    return _load_json(path)
 
 
 def build_tactic_name_to_id(tactics: dict[str, dict]) -> dict[str, str]:
@@ -256,6 +303,47 @@ def build_tactic_name_to_id(tactics: dict[str, dict]) -> dict[str, str]:
     return {v["name"]: k for k, v in tactics.items()}
 
 
+class TechniqueText(NamedTuple):
+    """Lowercased searchable text of one FT3 technique."""
+    id: str
+    name: str
+    name_lower: str
+    searchable: str              # name + " " + description, lowercased
+    # KEYWORD_VOCAB terms found in searchable -> score (3.0 if in the name)
+    keyword_weights: dict[str, float]
+
+
+def build_technique_index(techniques: list[dict]) -> list[TechniqueText]:
+    """Lowercase each technique's text once and score every keyword in it.
+
+    With pyahocorasick installed, a single automaton over KEYWORD_VOCAB
+    scans each technique once; otherwise each term is tested with ``in``.
+    Either way this runs once per technique rather than once per
+    technique per threat path.
+    """
+    automaton = None
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for term in KEYWORD_VOCAB:
+            automaton.add_word(term, term)
+        automaton.make_automaton()
+
+    index: list[TechniqueText] = []
+    for tech in techniques:
+        name_lower = tech.get("name", "").lower()
+        searchable = name_lower + " " + tech.get("description", "").lower()
+        if automaton is not None:
+            hits = {term for _, term in automaton.iter(searchable)}
+        else:
+            hits = {term for term in KEYWORD_VOCAB if term in searchable}
+        # Name match is worth more than description match
+        weights = {term: 3.0 if term in name_lower else 1.0 for term in hits}
+        index.append(TechniqueText(
+            tech["id"], tech.get("name", ""), name_lower, searchable, weights,
+        ))
+    return index
+
+
 # ---------------------------------------------------------------------------
 # Frontmatter parsing (reuse FLAME convention)
 # ---------------------------------------------------------------------------
@@ -265,23 +353,24 @@ FRONTMATTER_PATTERN = re.compile(
     re.DOTALL,
 )
 
+# Either ft3_tactics: [] with optional trailing comment (inline, comment),
+# or ft3_tactics: followed by YAML list items (block)
+FT3_TACTICS_RE = re.compile(
+    r"^(?:(?P<inline>ft3_tactics:\s*\[.*?\])(?P<comment>\s*#.*)?$"
+    r"|(?P<block>ft3_tactics:\s*\n(?:\s+-\s+.*\n)*))",
+    re.MULTILINE,
+)
+
 
 def extract_frontmatter_raw(filepath: Path) -> tuple[dict | None, str]:
     """Extract YAML frontmatter dict and the raw YAML string."""
-    try:
-        import yaml
-    except ImportError:
-        print("ERROR: pyyaml is required. Install with: pip install pyyaml",
-              file=sys.stderr)
-        sys.exit(1)
-
     text = filepath.read_text(encoding="utf-8")
     match = FRONTMATTER_PATTERN.search(text)
     if not match:
         return None, ""
     raw_yaml = match.group(1)
     try:
-        data = yaml.safe_load(raw_yaml)
+        data = yaml.load(raw_yaml, Loader=SafeLoader)
     except Exception as e:
         log.error("YAML parse error in %s: %s", filepath, e)
         return None, raw_yaml
@@ -316,7 +405,7 @@ def map_groupib_to_tactics(groupib_stages: list[str]) -> set[str]:
 
 def map_fraud_types_to_techniques(
     fraud_types: list[str],
-    techniques: list[dict],
+    tech_index: list[TechniqueText],
 ) -> list[tuple[str, str, float]]:
     """Signal 3: Match fraud_types keywords against FT3 technique names/descriptions.
 
@@ -324,42 +413,34 @@ def map_fraud_types_to_techniques(
     sorted by score descending. Only parent techniques and techniques
     with score > 0 are returned.
     """
-    # Collect all search terms for this TP's fraud types
-    all_terms: list[str] = []
+    # Collect all search terms for this TP's fraud types; each distinct
+    # term scores at most once per technique
+    all_terms: dict[str, None] = {}
     for ft in fraud_types:
         ft_key = ft.strip().lower()
         if ft_key in FRAUD_TYPE_KEYWORDS:
-            all_terms.extend(FRAUD_TYPE_KEYWORDS[ft_key])
+            all_terms.update(dict.fromkeys(FRAUD_TYPE_KEYWORDS[ft_key]))
         else:
             # Fallback: use the fraud type itself as a search term
-            all_terms.append(ft_key.replace("-", " "))
+            all_terms[ft_key.replace("-", " ")] = None
 
     if not all_terms:
         return []
 
     scored: list[tuple[str, str, float]] = []
-    for tech in techniques:
-        tech_id = tech["id"]
-        tech_name = tech.get("name", "").lower()
-        tech_desc = tech.get("description", "").lower()
-        searchable = tech_name + " " + tech_desc
-
+    # Plain tuple unpacking: the fields were lowercased once at load time
+    for tech_id, tech_name, name_lower, searchable, weights in tech_index:
         score = 0.0
-        matched_terms: set[str] = set()
         for term in all_terms:
-            term_lower = term.lower()
-            if term_lower in matched_terms:
-                continue
-            # Name match is worth more than description match
-            if term_lower in tech_name:
-                score += 3.0
-                matched_terms.add(term_lower)
-            elif term_lower in searchable:
-                score += 1.0
-                matched_terms.add(term_lower)
+            weight = weights.get(term)
+            if weight is not None:
+                score += weight
+            # Fallback terms are not in the precomputed weights; test them directly
+            elif term not in KEYWORD_VOCAB and term in searchable:
+                score += 3.0 if term in name_lower else 1.0
 
         if score > 0:
-            scored.append((tech_id, tech["name"], score))
+            scored.append((tech_id, tech_name, score))
 
     scored.sort(key=lambda x: x[2], reverse=True)
     return scored
@@ -394,32 +475,37 @@ def determine_confidence(
 
 def generate_notes(
     tp_id: str,
-    cfpf_tactics: set[str],
-    groupib_tactics: set[str],
+    cfpf_tactics: list[str],
+    groupib_tactics: list[str],
     combined_tactics: list[str],
     top_techniques: list[tuple[str, str, float]],
     fraud_types: list[str],
 ) -> str:
-    """Generate human-readable mapping notes."""
+    """Generate human-readable mapping notes.
+
+    The tactic lists must already be sorted; the breakdown keeps their order.
+    """
     parts: list[str] = []
 
     # Tactic source breakdown
-    both = cfpf_tactics & groupib_tactics
-    cfpf_only = cfpf_tactics - groupib_tactics
-    gib_only = groupib_tactics - cfpf_tactics
+    cfpf_set = set(cfpf_tactics)
+    gib_set = set(groupib_tactics)
+    both = [t for t in cfpf_tactics if t in gib_set]
+    cfpf_only = [t for t in cfpf_tactics if t not in gib_set]
+    gib_only = [t for t in groupib_tactics if t not in cfpf_set]
 
     if both:
         parts.append(
-            f"Tactics {', '.join(sorted(both))} confirmed by both "
+            f"Tactics {', '.join(both)} confirmed by both "
             f"CFPF and Group-IB signals"
         )
     if cfpf_only:
         parts.append(
-            f"Tactics {', '.join(sorted(cfpf_only))} from CFPF phases only"
+            f"Tactics {', '.join(cfpf_only)} from CFPF phases only"
         )
     if gib_only:
         parts.append(
-            f"Tactics {', '.join(sorted(gib_only))} from Group-IB stages only"
+            f"Tactics {', '.join(gib_only)} from Group-IB stages only"
         )
 
     # Technique summary
@@ -440,10 +526,17 @@ def generate_notes(
 
 def map_single_tp(
     meta: dict,
-    techniques: list[dict],
+    tech_by_id: dict[str, dict],
     tactic_name_to_id: dict[str, str],
+    tech_index: list[TechniqueText],
+    cache: dict[tuple, dict] | None = None,
 ) -> dict:
-    """Map a single threat path to FT3 suggestions."""
+    """Map a single threat path to FT3 suggestions.
+
+    The result depends only on the normalized CFPF phases, Group-IB stages
+    and fraud types, so when ``cache`` is given, threat paths sharing all
+    three reuse the first computed mapping (as an independent copy).
+    """
     tp_id = meta.get("id", "unknown")
     cfpf_phases = meta.get("cfpf_phases", [])
     groupib_stages = meta.get("groupib_stages", [])
@@ -465,18 +558,22 @@ def map_single_tp(
     else:
         fraud_types = []
 
+    key = (tuple(cfpf_phases), tuple(groupib_stages), tuple(fraud_types))
+    if cache is not None and key in cache:
+        return copy.deepcopy(cache[key])
+
     # Signal 1: CFPF -> tactics
     cfpf_tactics = map_cfpf_to_tactics(cfpf_phases)
 
     # Signal 2: Group-IB -> tactics
     groupib_tactics = map_groupib_to_tactics(groupib_stages)
 
-    # Combine tactic suggestions (union, sorted)
-    combined_tactics_set = cfpf_tactics | groupib_tactics
-    combined_tactics = sorted(combined_tactics_set)
+    # Sort each signal's tactics once; notes and _detail reuse these lists
+    cfpf_sorted = sorted(cfpf_tactics)
+    groupib_sorted = sorted(groupib_tactics)
 
     # Signal 3: Fraud type -> techniques
-    technique_matches = map_fraud_types_to_techniques(fraud_types, techniques)
+    technique_matches = map_fraud_types_to_techniques(fraud_types, tech_index)
 
     # Filter techniques: only include parent techniques (no sub-techniques)
     # unless the sub-technique has a very high score
@@ -505,34 +602,32 @@ def map_single_tp(
     technique_tactic_set: set[str] = set()
     for tid, tname, score in top_techniques:
         # Look up the technique's tactic
-        for tech in techniques:
-            if tech["id"] == tid:
-                tactic_name = tech.get("tactics", "")
-                if tactic_name in tactic_name_to_id:
-                    technique_tactic_set.add(tactic_name_to_id[tactic_name])
-                break
+        tech = tech_by_id.get(tid)
+        tactic_name = tech.get("tactics", "") if tech else ""
+        if tactic_name in tactic_name_to_id:
+            technique_tactic_set.add(tactic_name_to_id[tactic_name])
 
     # Merge technique-implied tactics (but don't let them dominate)
-    all_tactics = sorted(combined_tactics_set | technique_tactic_set)
+    all_tactics = sorted(cfpf_tactics | groupib_tactics | technique_tactic_set)
 
     confidence = determine_confidence(
         cfpf_tactics, groupib_tactics, top_techniques,
     )
 
     notes = generate_notes(
-        tp_id, cfpf_tactics, groupib_tactics, all_tactics,
+        tp_id, cfpf_sorted, groupib_sorted, all_tactics,
         top_techniques, fraud_types,
     )
 
-    return {
+    mapping = {
         "suggested_ft3_tactics": all_tactics,
         "suggested_ft3_techniques": [t[0] for t in top_techniques],
         "confidence": confidence,
         "notes": notes,
         # Store detailed breakdown for review
         "_detail": {
-            "cfpf_tactics": sorted(cfpf_tactics),
-            "groupib_tactics": sorted(groupib_tactics),
+            "cfpf_tactics": cfpf_sorted,
+            "groupib_tactics": groupib_sorted,
             "technique_implied_tactics": sorted(technique_tactic_set),
             "technique_scores": [
                 {"id": t[0], "name": t[1], "score": t[2]}
@@ -540,6 +635,64 @@ def map_single_tp(
             ],
         },
     }
+    if cache is not None:
+        cache[key] = copy.deepcopy(mapping)
+    return mapping
+
+
+# ---------------------------------------------------------------------------
+# Batch mapping
+# ---------------------------------------------------------------------------
+
+# Below this many files, process start-up costs more than the mapping itself
+PARALLEL_MAP_MIN_FILES = 64
+
+# (tech_by_id, tactic_name_to_id, tech_index, mapping_cache) for this process
+_worker_state: tuple = ()
+
+
+def _init_worker(
+    tech_by_id: dict[str, dict],
+    tactic_name_to_id: dict[str, str],
+    tech_index: list[TechniqueText],
+) -> None:
+    """Store the shared mapping inputs once per process, not once per task."""
+    global _worker_state
+    _worker_state = (tech_by_id, tactic_name_to_id, tech_index, {})
+
+
+def process_tp_file(filepath: Path) -> tuple[str | None, dict | None]:
+    """Parse one threat path file and map it to FT3 suggestions.
+
+    Returns (tp_id, mapping), or (None, None) when the file has no valid
+    frontmatter. Uses the inputs stored by _init_worker.
+    """
+    meta, _ = extract_frontmatter_raw(filepath)
+    if meta is None:
+        return None, None
+    tech_by_id, tactic_name_to_id, tech_index, cache = _worker_state
+    mapping = map_single_tp(meta, tech_by_id, tactic_name_to_id, tech_index, cache)
+    return meta.get("id", filepath.stem), mapping
+
+
+def _map_many(
+    tp_files: list[Path],
+    tech_by_id: dict[str, dict],
+    tactic_name_to_id: dict[str, str],
+    tech_index: list[TechniqueText],
+) -> list[tuple[str | None, dict | None]]:
+    """process_tp_file over ``tp_files``, in a process pool when worthwhile."""
+    initargs = (tech_by_id, tactic_name_to_id, tech_index)
+    workers = os.cpu_count() or 1
+    if workers < 2 or len(tp_files) < PARALLEL_MAP_MIN_FILES:
+        _init_worker(*initargs)
+        return [process_tp_file(fp) for fp in tp_files]
+    # About four chunks per worker: few enough IPC round trips, yet every
+    # worker gets a share and stragglers even out
+    chunksize = max(1, len(tp_files) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=initargs) as ex:
+        return list(ex.map(process_tp_file, tp_files, chunksize=chunksize))
 
 
 # ---------------------------------------------------------------------------
@@ -562,35 +715,30 @@ def apply_ft3_tactics(filepath: Path, tactic_ids: list[str]) -> bool:
     else:
         replacement = "ft3_tactics: []"
 
-    # Match the existing ft3_tactics line (handles [] or multi-line)
-    # Pattern 1: ft3_tactics: [] with optional trailing comment
-    pattern_inline = re.compile(
-        r"^(ft3_tactics:\s*\[.*?\])(\s*#.*)?$",
-        re.MULTILINE,
-    )
-    # Pattern 2: ft3_tactics: followed by YAML list items
-    pattern_block = re.compile(
-        r"^ft3_tactics:\s*\n((?:\s+-\s+.*\n)*)",
-        re.MULTILINE,
-    )
-
-    match_inline = pattern_inline.search(text)
-    match_block = pattern_block.search(text)
+    # Match the existing ft3_tactics line (handles [] or multi-line).
+    # An inline field takes precedence over a block list anywhere in the
+    # file, so after a block match keep scanning for a later inline one.
+    match = FT3_TACTICS_RE.search(text)
+    if match and match.group("inline") is None:
+        for later in FT3_TACTICS_RE.finditer(text, match.end()):
+            if later.group("inline") is not None:
+                match = later
+                break
 
-    if match_inline:
+    if match and match.group("inline") is not None:
         # Preserve any trailing comment
-        comment = match_inline.group(2) or ""
+        comment = match.group("comment") or ""
         new_text = (
-            text[:match_inline.start()]
+            text[:match.start()]
             + replacement
             + comment
-            + text[match_inline.end():]
+            + text[match.end():]
         )
-    elif match_block:
+    elif match:
         new_text = (
-            text[:match_block.start()]
+            text[:match.start()]
             + replacement + "\n"
-            + text[match_block.end():]
+            + text[match.end():]
         )
     else:
         log.warning("Could not find ft3_tactics field in %s", filepath)
@@ -648,6 +796,11 @@ def main():
     tactics = load_ft3_tactics(tactics_path)
     techniques = load_ft3_techniques(techniques_path)
     tactic_name_to_id = build_tactic_name_to_id(tactics)
+    # First occurrence wins; the vendored JSON repeats at least one ID
+    tech_by_id: dict[str, dict] = {}
+    for tech in techniques:
+        tech_by_id.setdefault(tech["id"], tech)
+    tech_index = build_technique_index(techniques)
 
     log.info("Loaded %d tactics, %d techniques", len(tactics), len(techniques))
 
@@ -676,15 +829,17 @@ def main():
     # Process each threat path
     results: dict[str, dict] = {}
     confidence_counts = {"high": 0, "medium": 0, "low": 0}
+    # TP id per file with valid frontmatter, reused by the apply pass
+    # instead of reading and parsing every file a second time
+    file_tp_ids: dict[Path, str] = {}
 
-    for filepath in tp_files:
-        meta, raw_yaml = extract_frontmatter_raw(filepath)
-        if meta is None:
+    mapped = _map_many(tp_files, tech_by_id, tactic_name_to_id, tech_index)
+    for filepath, (tp_id, mapping) in zip(tp_files, mapped):
+        if mapping is None:
             log.warning("Skipping %s: no valid frontmatter", filepath.name)
             continue
 
-        tp_id = meta.get("id", filepath.stem)
-        mapping = map_single_tp(meta, techniques, tactic_name_to_id)
+        file_tp_ids[filepath] = tp_id
         results[tp_id] = mapping
         confidence_counts[mapping["confidence"]] += 1
 
@@ -702,10 +857,13 @@ def main():
 
     # Write output JSON
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(
-        json.dumps(results, indent=2, ensure_ascii=False),
-        encoding="utf-8",
-    )
+    if orjson is not None:
+        output_path.write_bytes(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+    else:
+        output_path.write_text(
+            json.dumps(results, indent=2, ensure_ascii=False),
+            encoding="utf-8",
+        )
     log.info("Wrote mapping suggestions to %s", output_path)
 
     # Summary
@@ -735,13 +893,7 @@ def main():
         log.info("---")
         log.info("Applying mappings to frontmatter...")
         applied = 0
-        for filepath in tp_files:
-            meta, _ = extract_frontmatter_raw(filepath)
-            if meta is None:
-                continue
-            tp_id = meta.get("id", filepath.stem)
-            if tp_id not in results:
-                continue
+        for filepath, tp_id in file_tp_ids.items():
             tactic_ids = results[tp_id]["suggested_ft3_tactics"]
             technique_ids = results[tp_id]["suggested_ft3_techniques"]
             combined_ids = tactic_ids + technique_ids
@@ -3,15 +3,27 @@ models.py — Data models and config helpers for FLAME regulatory feed ingestion
 
 Defines the RegulatoryAlert dataclass for normalised alerts from any
 regulatory source, plus YAML config loading utilities.
+
+To export alerts without holding every row in memory, feed
+``RegulatoryAlert.iter_csv_rows(alerts)`` straight to a ``csv.writer``::
+
+    writer = csv.writer(fh)
+    writer.writerow(CSV_COLUMNS)
+    writer.writerows(RegulatoryAlert.iter_csv_rows(alerts))
 """
 
 from dataclasses import dataclass, field
-from datetime import date
+from datetime import date, datetime
 from pathlib import Path
-from typing import List, Union
+from typing import Iterable, Iterator, List, Union
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 
 # Column order used for CSV export
 CSV_COLUMNS: List[str] = [
@@ -27,9 +39,13 @@ CSV_COLUMNS: List[str] = [
 ]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RegulatoryAlert:
-    """A single normalised regulatory alert/advisory."""
+    """A single normalised regulatory alert/advisory.
+
+    Slotted (no per-instance ``__dict__``) and frozen: sources build each
+    alert complete, including ``mapped_tp_ids``, and nothing mutates it.
+    """
 
     source: str
     alert_id: str
@@ -47,13 +63,15 @@ class RegulatoryAlert:
         ``mapped_tp_ids`` is serialized as a ``|``-delimited string so it
         fits in a single CSV cell (e.g. ``TP-0012|TP-0034``).
         """
+        d = self.date
+        # datetime subclasses date; keep only its date part
+        if isinstance(d, datetime):
+            d = d.date()
         return [
             self.source,
             self.alert_id,
             self.title,
-            date(self.date.year, self.date.month, self.date.day).isoformat()
-            if isinstance(self.date, date)
-            else str(self.date),
+            d.isoformat() if isinstance(d, date) else str(d),
             self.category,
             "|".join(self.mapped_tp_ids),
             self.url,
@@ -61,6 +79,12 @@ class RegulatoryAlert:
             self.summary,
         ]
 
+    @staticmethod
+    def iter_csv_rows(alerts: Iterable["RegulatoryAlert"]) -> Iterator[list]:
+        """Yield ``to_csv_row()`` for each alert, one row at a time."""
+        for alert in alerts:
+            yield alert.to_csv_row()
+
 
 def load_source_config(path) -> dict:
     """Load a YAML regulatory-sources config file.
@@ -84,4 +108,4 @@ def load_source_config(path) -> dict:
     if not path.exists():
         raise FileNotFoundError(f"Config file not found: {path}")
     with open(path, "r", encoding="utf-8") as fh:
-        return yaml.safe_load(fh)
+        return yaml.load(fh, Loader=SafeLoader)
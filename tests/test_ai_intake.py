@@ -0,0 +1,243 @@
+"""
+test_ai_intake.py -- Tests for the AI-assisted threat path intake script.
+
+Covers: HTML-to-text charset detection on both parser paths, LLM provider
+fallback, the response cache, and TP ID assignment across --batch /
+--collect with an interactive intake in between.
+"""
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+# Add scripts dir to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import ai_intake
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _llm_output(tp_id: str, title: str) -> str:
+    """A minimal threat path as the LLM would return it."""
+    return (
+        f"# {tp_id}: {title}\n\n"
+        "```yaml\n---\n"
+        f"id: {tp_id}\n"
+        f'title: "{title}"\n'
+        "---\n```\n\n"
+        "## Summary\n\nText.\n"
+    )
+
+
+def _response(payload: bytes) -> MagicMock:
+    resp = MagicMock()
+    resp.content = payload
+    return resp
+
+
+@pytest.fixture
+def intake_env(tmp_path, monkeypatch):
+    """Point the script at a temp repo with one existing threat path."""
+    tp_dir = tmp_path / "ThreatPaths"
+    tp_dir.mkdir()
+    (tp_dir / "TP-0005-existing.md").write_text("# TP-0005: Existing\n")
+
+    monkeypatch.setattr(ai_intake, "REPO_ROOT", tmp_path)
+    monkeypatch.setattr(ai_intake, "THREAT_PATHS_DIR", tp_dir)
+    monkeypatch.setattr(ai_intake, "BATCH_MANIFEST_DIR", tmp_path / "batches")
+    monkeypatch.setattr(ai_intake, "fetch_url_content", lambda url: f"Article at {url}")
+    monkeypatch.setattr(ai_intake, "load_cfpf_techniques", lambda: "")
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    return tp_dir
+
+
+def _run_main(monkeypatch, *argv: str) -> int:
+    monkeypatch.setattr(sys, "argv", ["ai_intake.py", *argv])
+    return ai_intake.main()
+
+
+# ---------------------------------------------------------------------------
+# HTML charset detection
+# ---------------------------------------------------------------------------
+
+CP1252_PAGE = (
+    '<html><head><meta charset="windows-1252"><title>T</title></head>'
+    "<body><p>caf\u00e9 na\u00efve \u2014 \u201cquoted\u201d</p></body></html>"
+).encode("cp1252")
+
+
+class TestHtmlToTextCharset:
+    @pytest.mark.parametrize("use_lexbor", [True, False], ids=["selectolax", "bs4"])
+    def test_meta_declared_cp1252_page(self, monkeypatch, use_lexbor):
+        """Without a header charset, <meta charset> decides the decoding."""
+        if use_lexbor:
+            if ai_intake.LexborHTMLParser is None:
+                pytest.skip("selectolax not installed")
+        else:
+            monkeypatch.setattr(ai_intake, "LexborHTMLParser", None)
+        text = ai_intake._html_to_text(CP1252_PAGE)
+        assert "caf\u00e9 na\u00efve \u2014 \u201cquoted\u201d" in text
+
+    @pytest.mark.parametrize("use_lexbor", [True, False], ids=["selectolax", "bs4"])
+    def test_bom_declared_utf16_page(self, monkeypatch, use_lexbor):
+        """A byte order mark identifies the encoding."""
+        if use_lexbor:
+            if ai_intake.LexborHTMLParser is None:
+                pytest.skip("selectolax not installed")
+        else:
+            monkeypatch.setattr(ai_intake, "LexborHTMLParser", None)
+        page = "<html><body><p>caf\u00e9</p></body></html>".encode("utf-16")
+        assert ai_intake._html_to_text(page) == "caf\u00e9"
+
+
+# ---------------------------------------------------------------------------
+# LLM provider fallback
+# ---------------------------------------------------------------------------
+
+def _raise_index_error(system_prompt, user_prompt, api_key):
+    # e.g. data["content"][0] on a 200 response with an empty content list
+    raise IndexError("list index out of range")
+
+
+class TestGenerateThreatPath:
+    def test_raising_provider_falls_back_to_next(self, monkeypatch):
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "a-key")
+        monkeypatch.setenv("OPENAI_API_KEY", "o-key")
+        monkeypatch.setattr(ai_intake, "call_anthropic", _raise_index_error)
+        monkeypatch.setattr(ai_intake, "call_openai",
+                            lambda system, user, key: "# TP-0001: Fallback")
+        assert ai_intake.generate_threat_path("sys", "user") == (
+            "# TP-0001: Fallback", ai_intake.OPENAI_MODEL)
+
+    def test_raising_last_provider_fails_instead_of_hanging(self, monkeypatch, capsys):
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "a-key")
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        monkeypatch.setattr(ai_intake, "call_anthropic", _raise_index_error)
+        with pytest.raises(SystemExit):
+            ai_intake.generate_threat_path("sys", "user")
+        assert "All LLM API calls failed" in capsys.readouterr().err
+
+
+# ---------------------------------------------------------------------------
+# Response cache
+# ---------------------------------------------------------------------------
+
+class TestResponseCache:
+    def test_rerun_with_new_tp_id_and_date_hits_cache(self, tmp_path, monkeypatch):
+        """The key ignores TP ID and date; a hit is restamped with the new ones."""
+        monkeypatch.setattr(ai_intake, "CACHE_DIR", tmp_path / "cache")
+        calls = []
+
+        def fake_generate(system_prompt, user_prompt):
+            calls.append(user_prompt)
+            text = _llm_output("TP-0006", "Cached").replace(
+                'title: "Cached"\n', 'title: "Cached"\ndate: 2026-01-05\n')
+            return text + "\n| Date | Author | Change |\n| 2026-01-05 | A | Initial |\n", "m"
+
+        monkeypatch.setattr(ai_intake, "generate_threat_path", fake_generate)
+        intake = {"author": "A", "source_url": "https://a.example", "sector": "banking",
+                  "fraud_types": "wire-fraud", "context": "", "article_text": "Article"}
+
+        first, _ = ai_intake.cached_generate_threat_path(
+            "sys", "user TP-0006 2026-01-05", "TP-0006", "2026-01-05", intake)
+        second, model = ai_intake.cached_generate_threat_path(
+            "sys", "user TP-0007 2026-01-06", "TP-0007", "2026-01-06", intake)
+
+        assert len(calls) == 1
+        assert len(list((tmp_path / "cache").iterdir())) == 1
+        assert model == "m"
+        assert second.startswith("# TP-0007: Cached\n")
+        assert "\nid: TP-0007\n" in second
+        assert "\ndate: 2026-01-06\n" in second
+        assert "| 2026-01-06 | A | Initial |" in second
+        assert "TP-0006" not in second and "2026-01-05" not in second
+
+        ai_intake.cached_generate_threat_path(
+            "sys", "user", "TP-0007", "2026-01-06", {**intake, "sector": "insurance"})
+        assert len(calls) == 2
+
+
+# ---------------------------------------------------------------------------
+# Batch TP ID assignment
+# ---------------------------------------------------------------------------
+
+class TestBatchTpIds:
+    def test_ids_assigned_at_collect_after_interleaved_intake(
+        self, intake_env, monkeypatch, capsys,
+    ):
+        """IDs are not reserved at submit, so an intake in between keeps its own."""
+        submitted = {}
+
+        def fake_post(url, data, **kwargs):
+            submitted.update(json.loads(data))
+            return _response(b'{"id": "msgbatch_1"}')
+
+        monkeypatch.setattr(ai_intake.SESSION, "post", fake_post)
+        assert _run_main(monkeypatch, "--batch", "--url", "https://a.example",
+                         "--url", "https://b.example") == 0
+
+        requests_sent = submitted["requests"]
+        custom_ids = [r["custom_id"] for r in requests_sent]
+        assert len(set(custom_ids)) == 2
+        assert not any(c.startswith("TP-") for c in custom_ids)
+        assert "TP-0006" not in json.dumps(requests_sent)
+
+        # Interactive intake while the batch is pending takes TP-0006
+        monkeypatch.setattr(
+            ai_intake, "cached_generate_threat_path",
+            lambda system, user, *args, **kwargs: (_llm_output("TP-0006", "Interleaved"), "test"),
+        )
+        assert _run_main(monkeypatch, "--url", "https://c.example") == 0
+        assert (intake_env / "TP-0006-interleaved.md").exists()
+
+        # Results come back out of submission order
+        placeholder = ai_intake.BATCH_TP_ID_PLACEHOLDER
+        results = [
+            {"custom_id": custom_ids[1], "result": {"type": "succeeded", "message": {
+                "content": [{"text": _llm_output(placeholder, "Second")}]}}},
+            {"custom_id": custom_ids[0], "result": {"type": "succeeded", "message": {
+                "content": [{"text": _llm_output(placeholder, "First")}]}}},
+        ]
+
+        def fake_get(url, **kwargs):
+            if url.startswith(ai_intake.ANTHROPIC_BATCHES_URL):
+                return _response(json.dumps({
+                    "processing_status": "ended",
+                    "results_url": "https://results.example/msgbatch_1",
+                }).encode())
+            return _response("\n".join(json.dumps(r) for r in results).encode())
+
+        monkeypatch.setattr(ai_intake.SESSION, "get", fake_get)
+        capsys.readouterr()
+        assert _run_main(monkeypatch, "--collect", "msgbatch_1") == 0
+
+        summaries = json.loads(capsys.readouterr().out)
+        assert [(s["tp_id"], s["title"], s["source_url"]) for s in summaries] == [
+            ("TP-0007", "First", "https://a.example"),
+            ("TP-0008", "Second", "https://b.example"),
+        ]
+        written = sorted(p.name for p in intake_env.glob("TP-*.md"))
+        assert written == [
+            "TP-0005-existing.md",
+            "TP-0006-interleaved.md",
+            "TP-0007-first.md",
+            "TP-0008-second.md",
+        ]
+        first = (intake_env / "TP-0007-first.md").read_text()
+        assert first.startswith("# TP-0007: First\n")
+        assert "\nid: TP-0007\n" in first
+        assert placeholder not in first
+
+
+class TestAssignTpId:
+    def test_rewrites_title_and_quoted_frontmatter_id(self):
+        content = '# TP-0042: Title\n\n```yaml\n---\nid: "TP-0042"\n---\n```\n'
+        result = ai_intake.assign_tp_id(content, "TP-0101")
+        assert result.startswith("# TP-0101: Title\n")
+        assert 'id: "TP-0101"' in result
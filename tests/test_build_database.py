@@ -5,6 +5,8 @@ Tests pure functions: frontmatter extraction, body extraction,
 summary extraction, evidence parsing, and SQL whitelist validation.
 """
 
+import json
+import os
 import sqlite3
 import tempfile
 from pathlib import Path
@@ -20,8 +22,12 @@ from build_database import (
     extract_body,
     extract_summary,
     extract_evidence,
+    parse_markdown,
+    parse_all,
     _insert_multi,
-    _fetch_list,
+    _bulk_insert,
+    _write_json_array,
+    _preload,
     _VALID_MULTI_TABLES,
     init_database,
     build_regulatory_alerts,
@@ -253,7 +259,33 @@ class TestExtractEvidence:
 
 
 # ---------------------------------------------------------------------------
-# _insert_multi / _fetch_list whitelist tests
+# parse_markdown tests
+# ---------------------------------------------------------------------------
+
+class TestParseMarkdown:
+    def test_matches_individual_extractors(self, valid_tp_file):
+        meta, body, summary, evidence = parse_markdown(valid_tp_file)
+        assert meta == extract_frontmatter(valid_tp_file)
+        assert body == extract_body(valid_tp_file)
+        assert summary == extract_summary(body)
+        assert evidence == extract_evidence(body)
+
+    def test_missing_frontmatter(self, no_frontmatter_file):
+        assert parse_markdown(no_frontmatter_file) == (None, "", "", [])
+
+    def test_cache_reuses_unchanged_files(self, valid_tp_file, no_frontmatter_file):
+        cache = {}
+        first = parse_all([valid_tp_file, no_frontmatter_file], cache)
+        # Only successfully parsed files are cached
+        assert list(cache) == [str(valid_tp_file)]
+        cache[str(valid_tp_file)]["summary"] = "from cache"
+        second = parse_all([valid_tp_file, no_frontmatter_file], cache)
+        assert second[0][2] == "from cache"
+        assert second[1] == first[1]
+
+
+# ---------------------------------------------------------------------------
+# _insert_multi / _preload whitelist tests
 # ---------------------------------------------------------------------------
 
 class TestSQLWhitelist:
@@ -261,7 +293,7 @@ class TestSQLWhitelist:
         """All valid pairs should work without error."""
         for table, col in _VALID_MULTI_TABLES:
             _insert_multi(test_db, table, "TP-TEST", col, ["test-value"])
-            result = _fetch_list(test_db, table, col, "TP-TEST")
+            result = _preload(test_db, table, col).get("TP-TEST", [])
             assert "test-value" in result
 
     def test_invalid_table_raises_error(self, test_db):
@@ -271,21 +303,93 @@ class TestSQLWhitelist:
 
     def test_invalid_column_raises_error(self, test_db):
         with pytest.raises(ValueError, match="Invalid table/column pair"):
-            _fetch_list(test_db, "submission_sectors", "evil_col", "TP-TEST")
+            _preload(test_db, "submission_sectors", "evil_col")
 
     def test_empty_values_skipped(self, test_db):
         """Empty or None values should be silently skipped."""
         _insert_multi(test_db, "submission_sectors", "TP-TEST2", "sector",
                        ["banking", "", None, "insurance"])
-        result = _fetch_list(test_db, "submission_sectors", "sector", "TP-TEST2")
+        result = _preload(test_db, "submission_sectors", "sector").get("TP-TEST2", [])
         assert result == ["banking", "insurance"]
 
+    def test_duplicate_values_collapsed(self, test_db):
+        """Repeated values within one submission are stored once, first order kept."""
+        _insert_multi(test_db, "submission_tags", "TP-TEST4", "tag",
+                       ["phishing", "ato", "phishing"])
+        result = _preload(test_db, "submission_tags", "tag").get("TP-TEST4", [])
+        assert result == ["phishing", "ato"]
+
     def test_non_list_values_skipped(self, test_db):
         """Non-list values should be silently ignored."""
         _insert_multi(test_db, "submission_sectors", "TP-TEST3", "sector", "not-a-list")
-        result = _fetch_list(test_db, "submission_sectors", "sector", "TP-TEST3")
+        result = _preload(test_db, "submission_sectors", "sector").get("TP-TEST3", [])
         assert result == []
 
+    def test_non_string_submission_id(self, test_db):
+        """A numeric frontmatter id (e.g. YAML ``id: 1234``) is still ingested."""
+        _insert_multi(test_db, "submission_tags", 1234, "tag", ["phishing"])
+        rows = test_db.execute(
+            "SELECT tag FROM submission_tags WHERE submission_id = '1234'"
+        ).fetchall()
+        assert rows == [("phishing",)]
+
+    def test_bulk_insert_spans_chunks(self, test_db):
+        """Row counts above the bound-parameter limit are split across statements."""
+        rows = [("TP-BULK", f"tag-{i}") for i in range(1200)]
+        _bulk_insert(test_db, "submission_tags", ("submission_id", "tag"), rows)
+        result = _preload(test_db, "submission_tags", "tag").get("TP-BULK", [])
+        assert result == [tag for _, tag in rows]
+
+
+# ---------------------------------------------------------------------------
+# Streamed JSON export tests
+# ---------------------------------------------------------------------------
+
+class TestWriteJsonArray:
+    @pytest.mark.parametrize("entries", [
+        [],
+        [{"id": "TP-0001", "tags": ["a", "b"], "ucff_domains": {}}],
+        [{"id": "TP-0001", "summary": "line one\nline two"}, {"id": "TP-0002", "title": "Café"}],
+    ])
+    def test_matches_json_dumps(self, tmp_path, entries):
+        out = tmp_path / "out.json"
+        count = _write_json_array(out, iter(entries))
+        assert count == len(entries)
+        assert out.read_text(encoding="utf-8") == json.dumps(entries, indent=2, ensure_ascii=False)
+
+    def test_compact_round_trips(self, tmp_path):
+        entries = [{"id": "TP-0001", "title": "Café"}, {"id": "TP-0002", "tags": []}]
+        out = tmp_path / "out.json"
+        _write_json_array(out, iter(entries), compact=True)
+        text = out.read_text(encoding="utf-8")
+        assert "\n" not in text.rstrip("\n")
+        assert json.loads(text) == entries
+
+    def test_unchanged_output_not_rewritten(self, tmp_path):
+        entries = [{"id": "TP-0001"}]
+        out = tmp_path / "out.json"
+        _write_json_array(out, iter(entries))
+        os.utime(out, ns=(1_000_000_000, 1_000_000_000))
+        _write_json_array(out, iter(entries))
+        assert out.stat().st_mtime_ns == 1_000_000_000
+        assert list(tmp_path.iterdir()) == [out]
+
+        _write_json_array(out, iter([{"id": "TP-0002"}]))
+        assert json.loads(out.read_text(encoding="utf-8")) == [{"id": "TP-0002"}]
+
+    def test_failing_entries_leave_no_temp_file(self, tmp_path):
+        out = tmp_path / "out.json"
+        out.write_text("[]", encoding="utf-8")
+
+        def entries():
+            yield {"id": "TP-0001"}
+            raise ValueError("bad entry")
+
+        with pytest.raises(ValueError):
+            _write_json_array(out, entries())
+        assert list(tmp_path.iterdir()) == [out]
+        assert out.read_text(encoding="utf-8") == "[]"
+
 
 # ---------------------------------------------------------------------------
 # Regulatory alerts tests
@@ -5,6 +5,9 @@ Tests detection rule extraction, section parsing, phase mapping,
 and deterministic ID generation.
 """
 
+import json
+import os
+import uuid
 from pathlib import Path
 
 import pytest
@@ -15,8 +18,13 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
 from export_flame_stix import (
     extract_detection_section,
     extract_detection_rules,
+    find_tp_cross_refs,
+    scan_tp_body,
     map_cfpf_phases,
     deterministic_id,
+    write_json_array,
+    stage_json_array,
+    NAMESPACE,
 )
 
 
@@ -244,6 +252,71 @@ SELECT 1
         assert rules[0]["title"] == "TP-0099 detection rule (sql)"
 
 
+# ---------------------------------------------------------------------------
+# scan_tp_body tests
+# ---------------------------------------------------------------------------
+
+class TestScanTpBody:
+    def test_rules_and_refs_in_one_pass(self):
+        body = """\
+## Summary
+
+Builds on TP-0002.
+
+## Detection Approaches
+
+**Rule One**
+
+```spl
+index=main see TP-0003
+```
+
+## Related
+
+- TP-0002
+"""
+        rules, refs = scan_tp_body(body, "TP-0001", {"TP-0002", "TP-0003"})
+        assert [r["title"] for r in rules] == ["Rule One"]
+        assert refs == ["TP-0002", "TP-0003"]
+
+    def test_header_inside_fence_does_not_end_section(self):
+        body = """\
+## Detection Approaches
+
+```sql
+## not a header
+SELECT 1
+```
+
+```kql
+SigninLogs
+```
+"""
+        rules, _ = scan_tp_body(body, "TP-0001", set())
+        assert [r["type"] for r in rules] == ["sql", "kql"]
+        assert rules[0]["content"] == "## not a header\nSELECT 1"
+
+
+# ---------------------------------------------------------------------------
+# find_tp_cross_refs tests
+# ---------------------------------------------------------------------------
+
+class TestFindTpCrossRefs:
+    KNOWN = {"TP-0001", "TP-0002", "TP-0003"}
+
+    def test_refs_sorted_and_deduplicated(self):
+        body = "See TP-0003 and TP-0002. Also (TP-0003)."
+        assert find_tp_cross_refs(body, "TP-0001", self.KNOWN) == ["TP-0002", "TP-0003"]
+
+    def test_own_and_unknown_ids_skipped(self):
+        body = "TP-0001 relates to TP-0099."
+        assert find_tp_cross_refs(body, "TP-0001", self.KNOWN) == []
+
+    def test_word_boundaries_respected(self):
+        body = "XTP-0002 TP-00021 TP-0003_x TP-000 TP-0002"
+        assert find_tp_cross_refs(body, "TP-0001", self.KNOWN) == ["TP-0002"]
+
+
 # ---------------------------------------------------------------------------
 # map_cfpf_phases tests
 # ---------------------------------------------------------------------------
@@ -292,3 +365,56 @@ class TestDeterministicId:
         # UUID format: 8-4-4-4-12 hex chars
         uuid_part = result.split("--")[1]
         assert len(uuid_part) == 36
+
+    def test_matches_uuid5(self):
+        for seed in ("flame-TP-0001", "rel-a-related-to-b", "flame-Café"):
+            expected = f"relationship--{uuid.uuid5(NAMESPACE, seed)}"
+            assert deterministic_id("relationship", seed) == expected
+
+
+# ---------------------------------------------------------------------------
+# write_json_array tests
+# ---------------------------------------------------------------------------
+
+class TestWriteJsonArray:
+    @pytest.mark.parametrize("items", [
+        [],
+        [{"type": "spl", "content": "index=main\n| stats count", "title": "Café"}],
+        [{"tp_id": "TP-0001", "rules": []}, {"tp_id": "TP-0002"}],
+    ])
+    def test_matches_json_dump(self, tmp_path, items):
+        out = tmp_path / "rules.json"
+        assert write_json_array(out, iter(items)) == len(items)
+        assert out.read_text(encoding="utf-8") == json.dumps(items, indent=2, ensure_ascii=False)
+
+    def test_unchanged_output_not_rewritten(self, tmp_path):
+        out = tmp_path / "rules.json"
+        write_json_array(out, [{"type": "spl"}])
+        os.utime(out, ns=(1_000_000_000, 1_000_000_000))
+        write_json_array(out, [{"type": "spl"}])
+        assert out.stat().st_mtime_ns == 1_000_000_000
+        assert list(tmp_path.iterdir()) == [out]
+
+        write_json_array(out, [{"type": "sql"}])
+        assert json.loads(out.read_text(encoding="utf-8")) == [{"type": "sql"}]
+
+    def test_staged_array_left_for_caller(self, tmp_path):
+        out = tmp_path / "rules.json"
+        out.write_text("[]", encoding="utf-8")
+        count, tmp = stage_json_array(out, [{"type": "spl"}])
+        assert count == 1
+        assert out.read_text(encoding="utf-8") == "[]"
+        assert json.loads(tmp.read_text(encoding="utf-8")) == [{"type": "spl"}]
+
+    def test_failing_items_leave_no_temp_file(self, tmp_path):
+        out = tmp_path / "rules.json"
+        out.write_text("[]", encoding="utf-8")
+
+        def items():
+            yield {"type": "spl"}
+            raise ValueError("corrupt TP JSON")
+
+        with pytest.raises(ValueError):
+            write_json_array(out, items())
+        assert list(tmp_path.iterdir()) == [out]
+        assert out.read_text(encoding="utf-8") == "[]"
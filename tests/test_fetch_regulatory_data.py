@@ -7,6 +7,7 @@ write_csv output correctness, and write_csv with empty alerts list.
 
 import csv
 import sys
+import time
 from datetime import date
 from pathlib import Path
 from typing import List
@@ -156,6 +157,20 @@ class TestCollectAlerts:
         result = collect_alerts({})
         assert result == []
 
+    def test_collect_alerts_keeps_source_order(self):
+        """Results follow source order even when an earlier source finishes last."""
+        class _SlowSource(_MockSource):
+            def run(self):
+                time.sleep(0.05)
+                return self._alerts
+
+        sources = {
+            "slow": _SlowSource([_make_alert(source="slow", alert_id="S-001")]),
+            "fast": _MockSource([_make_alert(source="fast", alert_id="F-001")]),
+        }
+        result = collect_alerts(sources)
+        assert [a.alert_id for a in result] == ["S-001", "F-001"]
+
 
 # ---------------------------------------------------------------------------
 # write_csv tests
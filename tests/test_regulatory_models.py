@@ -6,6 +6,7 @@ YAML config loading, error handling for missing config files,
 and RegulatorySource base class behaviour.
 """
 
+import dataclasses
 import tempfile
 from datetime import date, datetime
 from pathlib import Path
@@ -123,6 +124,12 @@ class TestRegulatoryAlertCreation:
         assert no_tp_alert.mapped_tp_ids == []
         assert no_tp_alert.source == "sec"
 
+    def test_alert_is_slotted_and_frozen(self, sample_alert):
+        """Alerts carry no __dict__ and reject attribute assignment."""
+        assert not hasattr(sample_alert, "__dict__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            sample_alert.severity = "low"
+
 
 # ---------------------------------------------------------------------------
 # to_csv_row() serialization tests
@@ -151,6 +158,12 @@ class TestToCsvRow:
         tp_field = row[5]
         assert tp_field == ""
 
+    def test_iter_csv_rows_yields_rows_lazily(self, sample_alert, no_tp_alert):
+        """iter_csv_rows should be a generator of to_csv_row() results."""
+        rows = RegulatoryAlert.iter_csv_rows([sample_alert, no_tp_alert])
+        assert not isinstance(rows, list)
+        assert list(rows) == [sample_alert.to_csv_row(), no_tp_alert.to_csv_row()]
+
     def test_csv_row_field_order(self, sample_alert):
         """CSV row fields should match CSV_COLUMNS order."""
         row = sample_alert.to_csv_row()
@@ -218,6 +231,18 @@ class TestDatetimeNormalization:
         row = alert.to_csv_row()
         assert row[3] == "2026-01-01"
 
+    def test_plain_date_serialized_as_iso(self):
+        """A plain date value should be serialized as ISO-8601."""
+        alert = RegulatoryAlert(
+            source="test",
+            alert_id="T-003",
+            title="Date test",
+            date=date(2026, 3, 9),
+            category="test-cat",
+        )
+        row = alert.to_csv_row()
+        assert row[3] == "2026-03-09"
+
     def test_string_date_passthrough(self):
         """A plain string in the date field should be passed through via str()."""
         alert = RegulatoryAlert(